@@ -1,23 +1,123 @@
 """
 Flow Manager for QA Bot - Allows defining and updating test flows
 """
+import asyncio
+import copy
 import json
 import yaml
 import os
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from datetime import datetime
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+# Prefer the LibYAML-backed C loader, fall back to pure Python
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Screenshot file names use underscores instead of spaces
+_SPACE_TO_UNDERSCORE = str.maketrans(" ", "_")
+# XPath suggestions offered when a selector cannot be found
+_CLASS_XPATH = "//*[contains(@class, '{cls}' )]"
+_TEXT_OR_CLASS_XPATH = "//*[contains(text(), '{text}') or contains(@class, '{cls}' )]"
+# Flow file extensions in lookup order, with their parsers
+_FLOW_PARSERS = (
+    (".json", json.load),
+    (".yaml", lambda f: yaml.load(f, Loader=_YamlLoader)),
+)
+# Page load timings for check_performance, from the Navigation Timing Level 2 entry when
+# available (times are already relative to navigation start) and performance.timing otherwise
+_PERFORMANCE_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (nav) {
+        return {
+            navigationStart: performance.timeOrigin,
+            domContentLoaded: nav.domContentLoadedEventEnd,
+            loadEvent: nav.loadEventEnd,
+            responseStart: nav.responseStart,
+            responseEnd: nav.responseEnd
+        };
+    }
+    const perf = performance.timing;
+    return {
+        navigationStart: perf.navigationStart,
+        domContentLoaded: perf.domContentLoadedEventEnd - perf.navigationStart,
+        loadEvent: perf.loadEventEnd - perf.navigationStart,
+        responseStart: perf.responseStart - perf.navigationStart,
+        responseEnd: perf.responseEnd - perf.navigationStart
+    };
+}"""
+# innerText for a list of CSS selectors; selectors querySelector cannot parse (e.g. Playwright's
+# text= or xpath=) come back as null so the step falls back to page.inner_text()
+_READ_TEXTS_JS = """(selectors) => Object.fromEntries(selectors.map(s => {
+    try {
+        const el = document.querySelector(s);
+        return [s, el ? el.innerText : null];
+    } catch (e) {
+        return [s, null];
+    }
+}))"""
+# QABot attributes copied onto qa_bot.results after a flow so the HTML report includes them
+_TRANSFER_ATTRS = ("ui_issue_summary", "responsive_issue_summary", "responsiveness_scores",
+                   "broken_links", "js_errors")
+# Bytes read from a YAML flow when only its summary fields are needed
+_HEADER_BYTES = 2048
+# Top-level flow fields load_flow_header returns, besides the steps count
+_HEADER_FIELDS = ("name", "description", "base_url")
+# Starting point for create_template_flow; name and description are filled in per flow
+_TEMPLATE_FLOW_JSON = json.dumps({
+    "name": "",
+    "description": "",
+    "base_url": "https://example.com",
+    "steps": [
+        {
+            "name": "Navigate to home page",
+            "action": "navigate",
+            "url": "/"
+        },
+        {
+            "name": "Check UI elements",
+            "action": "check_ui"
+        },
+        {
+            "name": "Test responsive design",
+            "action": "test_responsive"
+        }
+    ],
+    "selectors": {
+        "login": {
+            "username": "input[type='email'], input[name='username']",
+            "password": "input[type='password']",
+            "submit": "button[type='submit']"
+        }
+    }
+})
 
 class FlowManager:
     """Manages test flows for the QA Bot"""
     
+    # Maximum number of parsed flows kept in memory
+    CACHE_SIZE = 32
+    # Absolute flows directories already created in this process
+    _ensured_dirs: set = set()
+    
     def __init__(self, flows_dir: str = "flows"):
         """Initialize the flow manager"""
         self.flows_dir = Path(flows_dir)
-        self.flows_dir.mkdir(exist_ok=True)
-        # Only create subdirectories for prod and uat
-        for env in ["prod", "uat"]:
-            (self.flows_dir / env).mkdir(exist_ok=True)
+        self._flows_dir_str = str(self.flows_dir)
+        # Parsed flows keyed by path, validated against (mtime_ns, size) so edits invalidate them
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # Only create the flows dir and its prod/uat subdirectories once per process
+        flows_key = os.path.abspath(self.flows_dir)
+        if flows_key not in FlowManager._ensured_dirs:
+            self.flows_dir.mkdir(exist_ok=True)
+            for env in ["prod", "uat"]:
+                (self.flows_dir / env).mkdir(exist_ok=True)
+            FlowManager._ensured_dirs.add(flows_key)
     
     def load_flow(self, flow_name: str, environment: str = "prod") -> Dict:
         """
@@ -30,20 +130,87 @@ class FlowManager:
         Returns:
             Flow definition as a dictionary
         """
-        # Try both YAML and JSON formats
-        flow_path_yaml = self.flows_dir / environment / f"{flow_name}.yaml"
-        flow_path_json = self.flows_dir / environment / f"{flow_name}.json"
+        # Prefer JSON, fall back to legacy YAML flows; a single stat per candidate
+        base_path = os.path.join(self._flows_dir_str, environment, flow_name)
+        for ext, parse in _FLOW_PARSERS:
+            flow_path = base_path + ext
+            try:
+                st = os.stat(flow_path)
+            except FileNotFoundError:
+                continue
+            return self._load_cached(flow_path, st, parse)
+        raise FileNotFoundError(f"Flow '{flow_name}' not found for environment '{environment}'")
+    
+    def load_flow_header(self, flow_name: str, environment: str = "prod") -> Dict:
+        """
+        Load the summary fields of a flow without keeping its steps
+        
+        Legacy YAML flows are parsed from their first few KB when every summary
+        field is known to be complete there; otherwise (and for JSON flows) the
+        whole flow is loaded.
+        
+        Args:
+            flow_name: Name of the flow to load
+            environment: Environment to load flow for (prod, uat)
+            
+        Returns:
+            Exactly these keys, whatever the file format or size: "name",
+            "description" and "base_url" (empty string when missing) and
+            "step_count" (number of steps)
+        """
+        base_path = os.path.join(self._flows_dir_str, environment, flow_name)
+        yaml_path = base_path + ".yaml"
+        if not os.path.exists(base_path + ".json") and os.path.exists(yaml_path):
+            with open(yaml_path, 'rb') as f:
+                head = f.read(_HEADER_BYTES)
+            truncated = len(head) == _HEADER_BYTES
+            if truncated:
+                # Drop the partially read last line so the truncated document still parses
+                head = head[:head.rfind(b"\n") + 1]
+            try:
+                header = yaml.load(head, Loader=_YamlLoader)
+            except yaml.YAMLError:
+                header = None
+            if isinstance(header, dict) and (not truncated or self._header_complete(header)):
+                return self._flow_summary(header)
+        return self._flow_summary(self.load_flow(flow_name, environment))
+    
+    @staticmethod
+    def _header_complete(header: Dict) -> bool:
+        """Whether a flow parsed from a file prefix holds every summary field uncut
         
-        if flow_path_yaml.exists():
-            with open(flow_path_yaml, 'r') as f:
-                return yaml.safe_load(f)
-        elif flow_path_json.exists():
-            with open(flow_path_json, 'r') as f:
-                return json.load(f)
+        The last top-level key may have been cut off mid-value (a wrapped description,
+        a steps list); every earlier key was followed by another one, so it is whole.
+        """
+        keys = list(header)
+        complete = keys[:-1]
+        return all(key in complete for key in _HEADER_FIELDS + ("steps",))
+    
+    @staticmethod
+    def _flow_summary(flow_data: Dict) -> Dict:
+        """The load_flow_header fields of a parsed flow"""
+        summary = {key: flow_data.get(key) or "" for key in _HEADER_FIELDS}
+        summary["step_count"] = len(flow_data.get("steps") or [])
+        return summary
+    
+    def _load_cached(self, flow_path: str, st: os.stat_result, parse) -> Dict:
+        """Parse a flow file, reusing the cached result while the file is unchanged"""
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._cache.get(flow_path)
+        if cached and cached[0] == signature:
+            flow_data = cached[1]
+            self._cache.move_to_end(flow_path)
         else:
-            raise FileNotFoundError(f"Flow '{flow_name}' not found for environment '{environment}'")
+            with open(flow_path, 'r') as f:
+                flow_data = parse(f)
+            self._cache[flow_path] = (signature, flow_data)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        # Callers (e.g. save_flow) mutate the returned dict, so never hand out the cached one
+        return copy.deepcopy(flow_data)
     
-    def save_flow(self, flow_name: str, flow_data: Dict, environment: str = "prod") -> str:
+    def save_flow(self, flow_name: str, flow_data: Dict, environment: str = "prod",
+                  fsync: bool = False) -> str:
         """
         Save a flow definition to file
         
@@ -51,22 +218,69 @@ class FlowManager:
             flow_name: Name of the flow to save
             flow_data: Flow definition data
             environment: Environment to save flow for (prod, uat)
+            fsync: Flush the file to disk before returning
             
         Returns:
             Path to the saved flow file
         """
-        # Add metadata
-        flow_data["metadata"] = {
-            "last_updated": datetime.now().isoformat(),
-            "environment": environment
-        }
+        return self.save_flows_bulk([(flow_name, flow_data, environment)], fsync=fsync)[0]
+    
+    def save_flows_bulk(self, flows: Iterable[Tuple[str, Dict, str]], fsync: bool = False) -> List[str]:
+        """
+        Save several flow definitions in one pass
         
-        # Save as YAML for better readability
-        flow_path = self.flows_dir / environment / f"{flow_name}.yaml"
-        with open(flow_path, 'w') as f:
-            yaml.dump(flow_data, f, default_flow_style=False)
+        Args:
+            flows: (flow_name, flow_data, environment) tuples
+            fsync: Flush each file to disk before moving it into place
+            
+        Returns:
+            Paths to the saved flow files, in input order
         
-        return str(flow_path)
+        Flows are always written as JSON; an existing legacy YAML file for the
+        same flow is removed so each flow has exactly one definition on disk.
+        """
+        # Serialize everything first so the writes run back to back
+        last_updated = datetime.now().isoformat()
+        pending = []
+        for flow_name, flow_data, environment in flows:
+            # Add metadata
+            flow_data["metadata"] = {
+                "last_updated": last_updated,
+                "environment": environment
+            }
+            # Save as JSON, which is much faster to parse than YAML on every run
+            flow_path = os.path.join(self._flows_dir_str, environment, f"{flow_name}.json")
+            pending.append((flow_path, json.dumps(flow_data, indent=2).encode("utf-8")))
+        for flow_path, payload in pending:
+            self._write_atomic(flow_path, payload, fsync)
+            # load_flow prefers JSON, so a legacy YAML copy left next to it would never run again
+            # but would still show up in editors; drop it once the JSON version is in place
+            legacy_path = flow_path[:-len(".json")] + ".yaml"
+            try:
+                os.unlink(legacy_path)
+            except FileNotFoundError:
+                pass
+            self._cache.pop(legacy_path, None)
+        return [flow_path for flow_path, _ in pending]
+    
+    @staticmethod
+    def _write_atomic(path: str, payload: bytes, fsync: bool = False) -> None:
+        """Write payload to a temp file next to path, then atomically replace path with it"""
+        # Same directory as the target so os.replace never crosses filesystems
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
     
     def list_flows(self, environment: Optional[str] = None) -> Dict[str, List[str]]:
         """
@@ -87,12 +301,18 @@ class FlowManager:
         
         for env in environments:
             env_dir = self.flows_dir / env
-            if env_dir.exists():
-                flows = []
-                for file_path in env_dir.glob("*.*"):
-                    if file_path.suffix.lower() in [".yaml", ".json"]:
-                        flows.append(file_path.stem)
-                result[env] = sorted(flows)
+            flows = []
+            # Single directory read; no per-entry Path objects or stat calls
+            try:
+                with os.scandir(env_dir) as entries:
+                    for entry in entries:
+                        stem, ext = os.path.splitext(entry.name)
+                        if ext.lower() in (".yaml", ".json") and entry.is_file():
+                            flows.append(stem)
+            except FileNotFoundError:
+                continue
+            # A flow may exist as both legacy YAML and JSON
+            result[env] = sorted(set(flows))
         
         return result
     
@@ -122,33 +342,10 @@ class FlowManager:
         Returns:
             Path to the created flow file
         """
-        template_flow = {
-            "name": flow_name,
-            "description": "Test flow for " + flow_name,
-            "base_url": "https://example.com",
-            "steps": [
-                {
-                    "name": "Navigate to home page",
-                    "action": "navigate",
-                    "url": "/"
-                },
-                {
-                    "name": "Check UI elements",
-                    "action": "check_ui"
-                },
-                {
-                    "name": "Test responsive design",
-                    "action": "test_responsive"
-                }
-            ],
-            "selectors": {
-                "login": {
-                    "username": "input[type='email'], input[name='username']",
-                    "password": "input[type='password']",
-                    "submit": "button[type='submit']"
-                }
-            }
-        }
+        # Decoding the pre-serialized template is a cheap deep copy
+        template_flow = json.loads(_TEMPLATE_FLOW_JSON)
+        template_flow["name"] = flow_name
+        template_flow["description"] = "Test flow for " + flow_name
         
         return self.save_flow(flow_name, template_flow, environment)
 
@@ -156,44 +353,184 @@ class FlowManager:
 class FlowExecutor:
     """Executes test flows using the QA Bot"""
     
-    def __init__(self, qa_bot, flow_manager=None):
+    # Absolute screenshot directories already created in this process
+    _ensured_dirs: set = set()
+    
+    def __init__(self, qa_bot, flow_manager=None, capture_diagnostics: bool = True):
         """
         Initialize the flow executor
         
         Args:
             qa_bot: Instance of QA Bot to use for execution
             flow_manager: Optional flow manager to use
+            capture_diagnostics: Attach a screenshot and HTML snippet to selector failures
         """
         self.qa_bot = qa_bot
         self.flow_manager = flow_manager or FlowManager()
+        self.capture_diagnostics = capture_diagnostics
+        self._screenshot_dir = "screenshots"
+        # Create the screenshots directory once per process rather than per executor or screenshot
+        screenshot_key = os.path.abspath(self._screenshot_dir)
+        if screenshot_key not in FlowExecutor._ensured_dirs:
+            os.makedirs(self._screenshot_dir, exist_ok=True)
+            FlowExecutor._ensured_dirs.add(screenshot_key)
+        # Screenshot names: one timestamp per executor plus a running counter
+        self._shot_stamp = time.time_ns()
+        self._shot_seq = 0
+        # Failure screenshot writes still running in the thread pool (path -> future), and per step/selector captures
+        self._pending_writes = {}
+        self._diagnostics_cache = {}
+        # Selector -> innerText read ahead for the current run of assert_text steps
+        self._prefetched_text = {}
+        self._flow_data = {}
+        # Step action -> coroutine handler(step, results, step_name, importance, step_start)
+        self._handlers = {
+            "navigate": self._do_navigate,
+            "check_ui": self._do_check_ui,
+            "test_responsive": self._do_test_responsive,
+            "check_links": self._do_check_links,
+            "fill_form": self._do_fill_form,
+            "click": self._do_click,
+            "wait": self._do_wait,
+            "check_element": self._do_check_element,
+            "check_accessibility": self._do_check_accessibility,
+            "assert_text": self._do_assert_text,
+            "screenshot": self._do_screenshot,
+            "check_performance": self._do_check_performance,
+            "auto_crawl": self._do_auto_crawl,
+        }
+    
+    @staticmethod
+    def _elapsed(step_start: float) -> float:
+        """Seconds elapsed since a step started (step_start from time.perf_counter())"""
+        return time.perf_counter() - step_start
+    
+    def _record_pass(self, results: Dict, step_name: str, step_start: float, importance: str,
+                     mirror: bool = False, **extra) -> None:
+        """Record a passed step, optionally mirroring it into qa_bot.results for the report"""
+        duration = self._elapsed(step_start)
+        results["passed"].append({
+            "step": step_name,
+            "duration": duration,
+            "importance": importance,
+            **extra
+        })
+        if mirror:
+            self.qa_bot.results.passed.append({
+                "step": step_name,
+                "duration": duration
+            })
+    
+    @staticmethod
+    def _fail(step_name: str, error: str, duration: float, importance: str, **extra) -> Dict:
+        """Build a failed-step entry"""
+        entry = {"step": step_name, "error": error, "duration": duration, "importance": importance}
+        if extra:
+            entry.update(extra)
+        return entry
+    
+    def _record_failure(self, results: Dict, step_name: str, error: str, step_start: float,
+                        importance: str, **extra) -> None:
+        """Record a failed step"""
+        results["failed"].append(self._fail(step_name, error, self._elapsed(step_start), importance, **extra))
+    
+    def _screenshot_path(self, step_name: str, ext: str = "png") -> str:
+        """Build a screenshot file path for a step inside the screenshots directory"""
+        self._shot_seq += 1
+        return os.path.join(self._screenshot_dir,
+                            f"{step_name.translate(_SPACE_TO_UNDERSCORE)}_{self._shot_stamp}_{self._shot_seq}.{ext}")
     
-    def safe_append(self, results: Dict, key: str, value: Dict) -> None:
-        """Safely append a value to a list in the results dictionary.
+    async def _capture_diagnostics(self, step_name: str, selector: Optional[str] = None) -> Dict:
+        """
+        Capture a screenshot and HTML snippet of the current page for a failed step
         
-        Args:
-            results: Results dictionary
-            key: Key of the list to append to
-            value: Value to append
+        The screenshot is a viewport-only JPEG written to the returned path in the background;
+        flush_artifacts() waits for the write. A step/selector pair is only captured once per executor.
         """
-        try:
-            # Initialize if key doesn't exist
-            if key not in results:
-                results[key] = []
-            
-            # Ensure the value at key is a list
-            if not isinstance(results[key], list):
-                print(f"[WARNING] results['{key}'] is not a list. Resetting to empty list.")
-                results[key] = []
+        if not self.capture_diagnostics:
+            return {}
+        key = (step_name, selector)
+        if key in self._diagnostics_cache:
+            return self._diagnostics_cache[key]
+        # Slice in the page so only the snippet crosses the CDP bridge, not the whole document
+        html_snippet = await self.qa_bot.page.evaluate("() => document.documentElement.outerHTML.slice(0, 1000)")
+        screenshot_path = self._screenshot_path(step_name, "jpg")
+        data = await self.qa_bot.page.screenshot(type="jpeg", quality=70)
+        self._pending_writes[screenshot_path] = asyncio.get_running_loop().run_in_executor(
+            None, Path(screenshot_path).write_bytes, data)
+        diagnostics = {
+            "screenshot": screenshot_path,
+            "html_snippet": html_snippet
+        }
+        self._diagnostics_cache[key] = diagnostics
+        return diagnostics
+    
+    async def flush_artifacts(self) -> List[str]:
+        """Wait for pending failure screenshot writes and return their paths"""
+        pending, self._pending_writes = self._pending_writes, {}
+        if pending:
+            await asyncio.gather(*pending.values())
+        return list(pending)
+    
+    def _page_gone(self) -> bool:
+        """True once the bot's page, or the browser behind it, has been closed"""
+        page = self.qa_bot.page
+        if page is None or page.is_closed():
+            return True
+        browser = getattr(self.qa_bot, "browser", None)
+        return browser is not None and not browser.is_connected()
+    
+    async def _run_with_retry(self, operation, results: Dict, step_name: str, importance: str,
+                              step_start: float, error_label: str, attempts: int = 2,
+                              mirror: bool = False, error_suffix: str = "",
+                              capture_diagnostics: bool = False, retry_timeouts: bool = True,
+                              selector: Optional[str] = None):
+        """
+        Run a step operation, retrying on exceptions and recording the final failure
+        
+        Args:
+            operation: Zero-argument coroutine function performing the step
+            results: Flow results dictionary
+            step_name: Name of the step
+            importance: Step importance
+            step_start: Time the step started
+            error_label: Prefix for the recorded error message
+            attempts: Number of attempts before giving up
+            mirror: Also record the failure in qa_bot.results for report generation
+            error_suffix: Extra text appended to the recorded error message
+            capture_diagnostics: Attach a screenshot and HTML snippet to the failure
+            retry_timeouts: Retry after a Playwright timeout even if the page has not navigated
+            selector: Selector the step targets, used to avoid duplicate diagnostics captures
             
-            # Append the value
-            results[key].append(value)
-        except Exception as e:
-            print(f"[WARNING] Failed to append to results['{key}']: {str(e)}")
-            # Try to recover by initializing
+        Returns:
+            Tuple of (succeeded, operation return value)
+        """
+        page_url = getattr(self.qa_bot.page, "url", None)
+        for attempt in range(attempts):
             try:
-                results[key] = [value]
-            except Exception as e2:
-                print(f"[ERROR] Could not recover from append failure: {str(e2)}")
+                return True, await operation()
+            except Exception as e:
+                # Nothing to retry against once the page or browser is closed
+                page_gone = self._page_gone()
+                # A selector that timed out on an unchanged page will time out again
+                deterministic = page_gone or (not retry_timeouts and isinstance(e, PlaywrightTimeoutError)
+                                              and getattr(self.qa_bot.page, "url", None) == page_url)
+                if attempt < attempts - 1 and not deterministic:
+                    continue
+                if attempts > 1:
+                    error = f"{error_label} (attempt {attempt+1}): {str(e)}{error_suffix}"
+                else:
+                    error = f"{error_label}: {str(e)}{error_suffix}"
+                extra = await self._capture_diagnostics(step_name, selector) if capture_diagnostics and not page_gone else {}
+                self._record_failure(results, step_name, error, step_start, importance, **extra)
+                if mirror:
+                    self.qa_bot.results.failed.append({
+                        "step": step_name,
+                        "error": f"{error_label}: {str(e)}",
+                        "duration": self._elapsed(step_start)
+                    })
+                break
+        return False, None
     
     async def execute_flow(self, flow_name: str, environment: str = "prod", 
                           credentials: Dict = None) -> Dict:
@@ -225,6 +562,7 @@ class FlowExecutor:
         # Set base URL
         if "base_url" in flow_data:
             self.qa_bot.base_url = flow_data["base_url"]
+        self._resolve_step_urls(flow_data.get("steps", []))
         
         # Make sure qa_bot.results is initialized if it doesn't exist
         if not hasattr(self.qa_bot, 'results') or self.qa_bot.results is None:
@@ -236,620 +574,47 @@ class FlowExecutor:
             login_url = flow_data.get("login_url", self.qa_bot.base_url)
             login_success = await self.qa_bot.login(login_url, credentials)
             if not login_success:
-                self.safe_append(results, "failed", {
+                results["failed"].append({
                     "step": "Login",
                     "error": "Login failed"
                 })
                 # Also add to qa_bot.results for report generation
-                if hasattr(self.qa_bot.results, 'failed') and isinstance(self.qa_bot.results.failed, list):
-                    self.qa_bot.results.failed.append({
-                        "step": "Login",
-                        "error": "Login failed"
-                    })
+                self.qa_bot.results.failed.append({
+                    "step": "Login",
+                    "error": "Login failed"
+                })
                 return results
         
-        # Execute each step in the flow
+        # Execute each step in the flow; consecutive steps sharing a "group" run concurrently
+        self._flow_data = flow_data
         skip_remaining = False
-        for step in flow_data.get("steps", []):
-            importance = step.get("importance", "normal") if step else "normal"
-            if skip_remaining and importance != "blocking":
-                self.safe_append(results, "skipped", {
-                    "step": step.get("name", "Unnamed step"),
-                    "reason": "Skipped due to blocking failure",
-                    "importance": importance
-                })
-                continue
-            try:
-                # Before executing a step, check if it's a 'navigate to login page' and user is already logged in
-                if step.get('action') == 'navigate' and 'login' in step.get('name', '').lower():
-                    if hasattr(self.qa_bot, 'is_logged_in') and await self.qa_bot.is_logged_in():
-                        self.qa_bot.results.passed.append({
-                            'step': step.get('name', 'Navigate to login page'),
-                            'status': 'Skipped (already logged in)'
-                        })
-                        continue
-                step_name = step.get("name", "Unknown step") if step else "Unknown step"
-                action = step.get("action", "") if step else ""
-                step_start = datetime.now()
-                if action == "navigate":
-                    url = step.get("url", "/") if step else "/"
-                    if not url.startswith("http"):
-                        url = f"{self.qa_bot.base_url.rstrip('/')}/{url.lstrip('/')}"
-                    for attempt in range(2):
-                        try:
-                            success = await self.qa_bot.navigate_to(url)
-                            break
-                        except Exception as e:
-                            if attempt == 1:
-                                duration = (datetime.now() - step_start).total_seconds()
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({"step": step_name, "error": f"Navigation error (attempt {attempt+1}): {str(e)}", "duration": duration, "importance": importance})
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                                success = False
-                    duration = (datetime.now() - step_start).total_seconds()
-                    if success:
-                        self.safe_append(results, "passed", {
-                            "step": step_name,
-                            "duration": duration,
-                            "importance": importance
-                        })
-                    else:
-                        self.safe_append(results, "failed", {
-                            "step": step_name,
-                            "error": "Navigation failed",
-                            "duration": duration,
-                            "importance": importance
-                        })
-                    # After each failure, if importance is 'blocking', set skip_remaining = True
-                    if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                        results["failed"][-1]["importance"] = importance
-                        skip_remaining = True
-                    elif results["failed"] and results["failed"][-1]["step"] == step_name:
-                        results["failed"][-1]["importance"] = importance
-                elif action == "check_ui":
-                    for attempt in range(2):
-                        try:
-                            await self.qa_bot.check_ui_elements()
-                            duration = (datetime.now() - step_start).total_seconds()
-                            self.safe_append(results, "passed", {
-                                "step": step_name,
-                                "duration": duration,
-                                "importance": importance
-                            })
-                            # Also add to qa_bot.results for report generation
-                            if hasattr(self.qa_bot.results, 'passed') and isinstance(self.qa_bot.results.passed, list):
-                                self.qa_bot.results.passed.append({
-                                    "step": step_name,
-                                    "duration": duration
-                                })
-                            break
-                        except Exception as e:
-                            if attempt == 1:
-                                duration = (datetime.now() - step_start).total_seconds()
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({"step": step_name, "error": f"UI check error (attempt {attempt+1}): {str(e)}", "duration": duration, "importance": importance})
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                                # Also add to qa_bot.results for report generation
-                                if hasattr(self.qa_bot.results, 'failed') and isinstance(self.qa_bot.results.failed, list):
-                                    self.qa_bot.results.failed.append({
-                                        "step": step_name,
-                                        "error": f"UI check error: {str(e)}",
-                                        "duration": duration
-                                    })
-                    # After each failure, if importance is 'blocking', set skip_remaining = True
-                    if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                        results["failed"][-1]["importance"] = importance
-                        skip_remaining = True
-                    elif results["failed"] and results["failed"][-1]["step"] == step_name:
-                        results["failed"][-1]["importance"] = importance
-                elif action == "test_responsive":
-                    url = step.get("url") if step else None
-                    for attempt in range(2):
-                        try:
-                            result = await self.qa_bot.test_responsive_design(url=url)
-                            duration = (datetime.now() - step_start).total_seconds()
-                            self.safe_append(results, "passed", {
-                                "step": step_name,
-                                "duration": duration,
-                                "importance": importance
-                            })
-                            # Also add to qa_bot.results for report generation
-                            if hasattr(self.qa_bot.results, 'passed') and isinstance(self.qa_bot.results.passed, list):
-                                self.qa_bot.results.passed.append({
-                                    "step": step_name,
-                                    "duration": duration
-                                })
-                            break
-                        except Exception as e:
-                            if attempt == 1:
-                                duration = (datetime.now() - step_start).total_seconds()
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({"step": step_name, "error": f"Responsive test error (attempt {attempt+1}): {str(e)}", "duration": duration, "importance": importance})
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                                # Also add to qa_bot.results for report generation
-                                if hasattr(self.qa_bot.results, 'failed') and isinstance(self.qa_bot.results.failed, list):
-                                    self.qa_bot.results.failed.append({
-                                        "step": step_name,
-                                        "error": f"Responsive test error: {str(e)}",
-                                        "duration": duration
-                                    })
-                    # After each failure, if importance is 'blocking', set skip_remaining = True
-                    if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                        results["failed"][-1]["importance"] = importance
-                        skip_remaining = True
-                elif action == "check_links":
-                    for attempt in range(2):
-                        try:
-                            await self.qa_bot.check_for_broken_links()
-                            duration = (datetime.now() - step_start).total_seconds()
-                            self.safe_append(results, "passed", {
-                                "step": step_name,
-                                "duration": duration,
-                                "importance": importance
-                            })
-                            break
-                        except Exception as e:
-                            if attempt == 1:
-                                duration = (datetime.now() - step_start).total_seconds()
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({"step": step_name, "error": f"Link check error (attempt {attempt+1}): {str(e)}", "duration": duration, "importance": importance})
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                    # After each failure, if importance is 'blocking', set skip_remaining = True
-                    if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                        results["failed"][-1]["importance"] = importance
-                        skip_remaining = True
-                elif action == "fill_form":
-                    form_selector = step.get("form_selector", "form") if step else "form"
-                    fields = step.get("fields", {}) if step else {}
-                    for attempt in range(2):
-                        try:
-                            await self.qa_bot.test_form_submission(form_selector, fields)
-                            duration = (datetime.now() - step_start).total_seconds()
-                            self.safe_append(results, "passed", {
-                                "step": step_name,
-                                "duration": duration,
-                                "importance": importance
-                            })
-                            break
-                        except Exception as e:
-                            if attempt == 1:
-                                duration = (datetime.now() - step_start).total_seconds()
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({"step": step_name, "error": f"Form fill error (attempt {attempt+1}): {str(e)}", "duration": duration, "importance": importance})
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                    # After each failure, if importance is 'blocking', set skip_remaining = True
-                    if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                        results["failed"][-1]["importance"] = importance
-                        skip_remaining = True
-                elif action == "click":
-                    selector = step.get("selector") if step else None
-                    if selector and self.qa_bot.page:
-                        for attempt in range(2):
-                            try:
-                                await self.qa_bot.page.click(selector, timeout=10000)
-                                if step.get("wait_for_navigation", False):
-                                    await self.qa_bot.page.wait_for_load_state("networkidle", timeout=15000)
-                                duration = (datetime.now() - step_start).total_seconds()
-                                self.safe_append(results, "passed", {
-                                    "step": step_name,
-                                    "duration": duration,
-                                    "importance": importance
-                                })
-                                break
-                            except Exception as e:
-                                if attempt == 1:
-                                    duration = (datetime.now() - step_start).total_seconds()
-                                    html_snippet = await self.qa_bot.page.content()
-                                    screenshot_path = f"screenshots/{step_name.replace(' ', '_')}_{int(datetime.now().timestamp())}.png"
-                                    os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-                                    await self.qa_bot.page.screenshot(path=screenshot_path, full_page=True)
-                                    xpath_suggestion = f"//*[contains(@class, '{selector.strip('.')}' )]"
-                                    if "failed" not in results:
-                                        results["failed"] = []
-                                    if isinstance(results["failed"], list):
-                                        results["failed"].append({
-                                            "step": step_name,
-                                            "error": f"Click error (attempt {attempt+1}): {str(e)}. XPath suggestion: {xpath_suggestion}",
-                                            "screenshot": screenshot_path,
-                                            "html_snippet": html_snippet[:1000],
-                                            "duration": duration,
-                                            "importance": importance
-                                        })
-                                    else:
-                                        print("DEBUG: results['failed'] is not a list!")
-                                    # After each failure, if importance is 'blocking', set skip_remaining = True
-                                    if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                                        results["failed"][-1]["importance"] = importance
-                                        skip_remaining = True
-                                    elif results["failed"] and results["failed"][-1]["step"] == step_name:
-                                        results["failed"][-1]["importance"] = importance
-                    else:
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if "failed" not in results:
-                            results["failed"] = []
-                        if isinstance(results["failed"], list):
-                            results["failed"].append({"step": step_name, "error": "Missing selector or page not available", "duration": duration, "importance": importance})
-                        else:
-                            print("DEBUG: results['failed'] is not a list!")
-                        # After each failure, if importance is 'blocking', set skip_remaining = True
-                        if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                            results["failed"][-1]["importance"] = importance
-                            skip_remaining = True
-                elif action == "wait":
-                    duration_ms = step.get("duration", 1000) if step else 1000
-                    try:
-                        await self.qa_bot.page.wait_for_timeout(duration_ms)
-                        duration = (datetime.now() - step_start).total_seconds()
-                        self.safe_append(results, "passed", {
-                            "step": step_name,
-                            "duration": duration,
-                            "importance": importance
-                        })
-                    except Exception as e:
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if "failed" not in results:
-                            results["failed"] = []
-                        if isinstance(results["failed"], list):
-                            results["failed"].append({"step": step_name, "error": f"Wait error: {str(e)}", "duration": duration, "importance": importance})
-                        else:
-                            print("DEBUG: results['failed'] is not a list!")
-                        # After each failure, if importance is 'blocking', set skip_remaining = True
-                        if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                            results["failed"][-1]["importance"] = importance
-                            skip_remaining = True
-                elif action == "check_element":
-                    selector = step.get("selector") if step else None
-                    expected_visible = step.get("visible", True) if step else True
-                    if selector and self.qa_bot.page:
-                        for attempt in range(2):
-                            try:
-                                is_visible = await self.qa_bot.page.is_visible(selector, timeout=10000)
-                                if is_visible == expected_visible:
-                                    duration = (datetime.now() - step_start).total_seconds()
-                                    self.safe_append(results, "passed", {
-                                        "step": step_name,
-                                        "duration": duration,
-                                        "importance": importance
-                                    })
-                                else:
-                                    state = "visible" if expected_visible else "invisible"
-                                    duration = (datetime.now() - step_start).total_seconds()
-                                    if "failed" not in results:
-                                        results["failed"] = []
-                                    if isinstance(results["failed"], list):
-                                        results["failed"].append({"step": step_name, "error": f"Element should be {state}", "duration": duration, "importance": importance})
-                                    else:
-                                        print("DEBUG: results['failed'] is not a list!")
-                                break
-                            except Exception as e:
-                                if attempt == 1:
-                                    duration = (datetime.now() - step_start).total_seconds()
-                                    html_snippet = await self.qa_bot.page.content()
-                                    screenshot_path = f"screenshots/{step_name.replace(' ', '_')}_{int(datetime.now().timestamp())}.png"
-                                    os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-                                    await self.qa_bot.page.screenshot(path=screenshot_path, full_page=True)
-                                    xpath_suggestion = f"//*[contains(@class, '{selector.strip('.')}' )]"
-                                    if "failed" not in results:
-                                        results["failed"] = []
-                                    if isinstance(results["failed"], list):
-                                        results["failed"].append({
-                                            "step": step_name,
-                                            "error": f"Element check error (attempt {attempt+1}): {str(e)}. XPath suggestion: {xpath_suggestion}",
-                                            "screenshot": screenshot_path,
-                                            "html_snippet": html_snippet[:1000],
-                                            "duration": duration,
-                                            "importance": importance
-                                        })
-                                    else:
-                                        print("DEBUG: results['failed'] is not a list!")
-                                    # After each failure, if importance is 'blocking', set skip_remaining = True
-                                    if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                                        results["failed"][-1]["importance"] = importance
-                                        skip_remaining = True
-                                    elif results["failed"] and results["failed"][-1]["step"] == step_name:
-                                        results["failed"][-1]["importance"] = importance
-                    else:
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if "failed" not in results:
-                            results["failed"] = []
-                        if isinstance(results["failed"], list):
-                            results["failed"].append({"step": step_name, "error": "Missing selector or page not available", "duration": duration, "importance": importance})
-                        else:
-                            print("DEBUG: results['failed'] is not a list!")
-                        # After each failure, if importance is 'blocking', set skip_remaining = True
-                        if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                            results["failed"][-1]["importance"] = importance
-                            skip_remaining = True
-                elif action == "check_accessibility":
-                    step_start = datetime.now()
-                    try:
-                        violations = await self.qa_bot.check_accessibility()
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if violations:
-                            # Count critical/serious
-                            criticals = [v for v in violations if v.get('impact') in ('critical', 'serious')]
-                            if criticals:
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({
-                                        "step": step_name,
-                                        "error": f"Accessibility violations: {len(criticals)} critical/serious issues",
-                                        "violations": criticals,
-                                        "duration": duration,
-                                        "importance": importance
-                                    })
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                            else:
-                                self.safe_append(results, "passed", {
-                                    "step": step_name,
-                                    "duration": duration,
-                                    "violations": violations,
-                                    "importance": importance
-                                })
-                        else:
-                            self.safe_append(results, "passed", {
-                                "step": step_name,
-                                "duration": duration,
-                                "importance": importance
-                            })
-                    except Exception as e:
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if "failed" not in results:
-                            results["failed"] = []
-                        if isinstance(results["failed"], list):
-                            results["failed"].append({"step": step_name, "error": f"Accessibility check error: {str(e)}", "duration": duration, "importance": importance})
-                        else:
-                            print("DEBUG: results['failed'] is not a list!")
-                        # After each failure, if importance is 'blocking', set skip_remaining = True
-                        if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                            results["failed"][-1]["importance"] = importance
-                            skip_remaining = True
-                elif action == "assert_text":
-                    selector = step.get("selector") if step else None
-                    expected_text = step.get("text") if step else None
-                    should_exist = step.get("should_exist", True) if step else True
-                    step_start = datetime.now()
-                    try:
-                        if selector and expected_text and self.qa_bot.page:
-                            try:
-                                content = await self.qa_bot.page.inner_text(selector)
-                                found = expected_text in content
-                            except Exception as e:
-                                # Auto-heal: suggest XPath, screenshot, HTML snippet
-                                duration = (datetime.now() - step_start).total_seconds()
-                                html_snippet = await self.qa_bot.page.content()
-                                screenshot_path = f"screenshots/{step_name.replace(' ', '_')}_{int(datetime.now().timestamp())}.png"
-                                os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-                                await self.qa_bot.page.screenshot(path=screenshot_path, full_page=True)
-                                xpath_suggestion = f"//*[contains(text(), '{expected_text}') or contains(@class, '{selector.strip('.')}' )]"
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({
-                                        "step": step_name,
-                                        "error": f"Selector '{selector}' not found. XPath suggestion: {xpath_suggestion}",
-                                        "screenshot": screenshot_path,
-                                        "html_snippet": html_snippet[:1000],
-                                        "duration": duration,
-                                        "importance": importance
-                                    })
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                                # After each failure, if importance is 'blocking', set skip_remaining = True
-                                if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                                    results["failed"][-1]["importance"] = importance
-                                    skip_remaining = True
-                                continue
-                            duration = (datetime.now() - step_start).total_seconds()
-                            if (found and should_exist) or (not found and not should_exist):
-                                self.safe_append(results, "passed", {
-                                    "step": step_name,
-                                    "duration": duration,
-                                    "importance": importance
-                                })
-                            else:
-                                if "failed" not in results:
-                                    results["failed"] = []
-                                if isinstance(results["failed"], list):
-                                    results["failed"].append({"step": step_name, "error": f"Text '{expected_text}' not found in {selector}", "duration": duration, "importance": importance})
-                                else:
-                                    print("DEBUG: results['failed'] is not a list!")
-                        else:
-                            duration = (datetime.now() - step_start).total_seconds()
-                            if "failed" not in results:
-                                results["failed"] = []
-                            if isinstance(results["failed"], list):
-                                results["failed"].append({"step": step_name, "error": "Missing selector or text for assert_text", "duration": duration, "importance": importance})
-                                print("DEBUG: results['failed'] is not a list!")
-                    except Exception as e:
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if "failed" not in results:
-                            results["failed"] = []
-                        if isinstance(results["failed"], list):
-                            results["failed"].append({"step": step_name, "error": f"Assert text error: {str(e)}", "duration": duration, "importance": importance})
-                            print("DEBUG: results['failed'] is not a list!")
-                        # After each failure, if importance is 'blocking', set skip_remaining = True
-                        if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                            results["failed"][-1]["importance"] = importance
-                            skip_remaining = True
-                elif action == "screenshot":
-                    step_start = datetime.now()
-                    try:
-                        if self.qa_bot.page:
-                            screenshot_path = f"screenshots/{step_name.replace(' ', '_')}_{int(datetime.now().timestamp())}.png"
-                            os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-                            await self.qa_bot.page.screenshot(path=screenshot_path, full_page=True)
-                            duration = (datetime.now() - step_start).total_seconds()
-                            self.safe_append(results, "passed", {
-                                "step": step_name,
-                                "screenshot": screenshot_path,
-                                "duration": duration,
-                                "importance": importance
-                            })
-                        else:
-                            duration = (datetime.now() - step_start).total_seconds()
-                            if "failed" not in results:
-                                results["failed"] = []
-                            if isinstance(results["failed"], list):
-                                results["failed"].append({"step": step_name, "error": "No page available for screenshot", "duration": duration, "importance": importance})
-                                print("DEBUG: results['failed'] is not a list!")
-                    except Exception as e:
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if "failed" not in results:
-                            results["failed"] = []
-                        if isinstance(results["failed"], list):
-                            results["failed"].append({"step": step_name, "error": f"Screenshot error: {str(e)}", "duration": duration, "importance": importance})
-                            print("DEBUG: results['failed'] is not a list!")
-                        # After each failure, if importance is 'blocking', set skip_remaining = True
-                        if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                            results["failed"][-1]["importance"] = importance
-                            skip_remaining = True
-                elif action == "check_performance":
-                    step_start = datetime.now()
-                    try:
-                        if self.qa_bot.page:
-                            perf = await self.qa_bot.page.evaluate("""
-                                () => {
-                                    const perf = window.performance.timing;
-                                    return {
-                                        navigationStart: perf.navigationStart,
-                                        domContentLoaded: perf.domContentLoadedEventEnd - perf.navigationStart,
-                                        loadEvent: perf.loadEventEnd - perf.navigationStart,
-                                        responseStart: perf.responseStart - perf.navigationStart,
-                                        responseEnd: perf.responseEnd - perf.navigationStart
-                                    };
-                                }
-                            """)
-                            duration = (datetime.now() - step_start).total_seconds()
-                            self.safe_append(results, "passed", {
-                                "step": step_name,
-                                "performance": perf,
-                                "duration": duration,
-                                "importance": importance
-                            })
-                        else:
-                            duration = (datetime.now() - step_start).total_seconds()
-                            if "failed" not in results:
-                                results["failed"] = []
-                            if isinstance(results["failed"], list):
-                                results["failed"].append({"step": step_name, "error": "No page available for performance check", "duration": duration, "importance": importance})
-                                print("DEBUG: results['failed'] is not a list!")
-                    except Exception as e:
-                        duration = (datetime.now() - step_start).total_seconds()
-                        if "failed" not in results:
-                            results["failed"] = []
-                        if isinstance(results["failed"], list):
-                            results["failed"].append({"step": step_name, "error": f"Performance check error: {str(e)}", "duration": duration, "importance": importance})
-                            print("DEBUG: results['failed'] is not a list!")
-                        # After each failure, if importance is 'blocking', set skip_remaining = True
-                        if results["failed"] and results["failed"][-1]["step"] == step_name and importance == "blocking":
-                            results["failed"][-1]["importance"] = importance
-                            skip_remaining = True
-                elif action == "auto_crawl":
-                    # Auto-crawl logic
-                    max_pages = step.get("max_pages", 10)
-                    # Support custom nav_selector from flow YAML
-                    nav_selector = flow_data.get("nav_selector")
-                    # Discover links from the current page
-                    links = await self.qa_bot.discover_links(max_pages, nav_selector)
-                    if not links:
-                        self.safe_append(results, "failed", {
-                            "step": step_name,
-                            "error": "No internal links found to crawl",
-                            "duration": 0,
-                            "importance": "critical"
-                        })
-                    else:
-                        for i, link in enumerate(links):
-                            crawl_step_name = f"Crawl Page {i+1}: {link}"
-                            crawl_start = datetime.now()
-                            try:
-                                nav_success = await self.qa_bot.navigate_to(link)
-                                nav_duration = (datetime.now() - crawl_start).total_seconds()
-                                if nav_success:
-                                    # UI check
-                                    try:
-                                        await self.qa_bot.check_ui_elements()
-                                    except Exception as e:
-                                        self.safe_append(results, "failed", {
-                                            "step": crawl_step_name + " (UI check)",
-                                            "error": str(e),
-                                            "duration": nav_duration,
-                                            "importance": "normal"
-                                        })
-                                    # Responsive check
-                                    try:
-                                        await self.qa_bot.test_responsive_design(url=link)
-                                    except Exception as e:
-                                        self.safe_append(results, "failed", {
-                                            "step": crawl_step_name + " (Responsive check)",
-                                            "error": str(e),
-                                            "duration": nav_duration,
-                                            "importance": "normal"
-                                        })
-                                    self.safe_append(results, "passed", {
-                                        "step": crawl_step_name,
-                                        "url": link,
-                                        "duration": nav_duration,
-                                        "importance": "normal"
-                                    })
-                                else:
-                                    self.safe_append(results, "failed", {
-                                        "step": crawl_step_name,
-                                        "url": link,
-                                        "error": "Navigation failed",
-                                        "duration": nav_duration,
-                                        "importance": "normal"
-                                    })
-                            except Exception as e:
-                                nav_duration = (datetime.now() - crawl_start).total_seconds()
-                                self.safe_append(results, "failed", {
-                                    "step": crawl_step_name,
-                                    "url": link,
-                                    "error": str(e),
-                                    "duration": nav_duration,
-                                    "importance": "normal"
-                                })
-                else:
-                    duration = (datetime.now() - step_start).total_seconds()
-                    self.safe_append(results, "skipped", {
-                        "step": step_name,
-                        "reason": f"Unknown action: {action}",
-                        "duration": duration,
-                        "importance": importance
-                    })
-            except Exception as e:
-                duration = (datetime.now() - step_start).total_seconds()
-                if "failed" not in results:
-                    results["failed"] = []
-                if isinstance(results["failed"], list):
-                    # Always include step name and error
-                    fail_entry = {
-                        "step": step_name if step_name else "[Step name missing]",
-                        "error": str(e) if str(e) else "[No error message provided]",
-                        "duration": duration,
-                        "importance": importance
-                    }
-                    results["failed"].append(fail_entry)
-                else:
-                    print("DEBUG: results['failed'] is not a list!")
+        # Empty or malformed entries (e.g. a bare string) run as unnamed steps and are skipped as unknown
+        steps = [step if isinstance(step, dict) else {} for step in flow_data.get("steps", [])]
+        unknown = self.unknown_actions(steps)
+        if unknown:
+            # Report every bad step once up front; each is still skipped when reached
+            print(f"[WARNING] Flow '{flow_name}' has steps with unknown actions: "
+                  + ", ".join(f"{name} ({action or 'none'})" for name, action in unknown))
+        assert_runs = self._assert_text_runs(steps)
+        for batch in self._batch_steps(steps):
+            # Read the texts for a run of assert_text steps in one round-trip; any other batch (including
+            # a concurrent group) may change the page, so the read-ahead texts are dropped before it runs
+            if len(batch) == 1 and batch[0].get("action") == "assert_text":
+                if id(batch[0]) in assert_runs and not skip_remaining:
+                    self._prefetched_text = await self._read_texts(assert_runs[id(batch[0])])
+            else:
+                self._prefetched_text = {}
+            if len(batch) == 1:
+                outcomes = [await self._run_step(batch[0], results, skip_remaining)]
+            else:
+                outcomes = await asyncio.gather(
+                    *(self._run_step(step, results, skip_remaining) for step in batch),
+                    return_exceptions=True
+                )
+            if any(outcome is True for outcome in outcomes):
+                skip_remaining = True
+        self._prefetched_text = {}
+        await self.flush_artifacts()
         
         # After all steps, add coverage summary
         total_steps = len(flow_data.get("steps", []))
@@ -867,19 +632,333 @@ class FlowExecutor:
         
         # Transfer any UI or responsive test results to qa_bot.results if they're not already there
         # This ensures the HTML report will include all the data
-        if hasattr(self.qa_bot, 'ui_issue_summary') and self.qa_bot.ui_issue_summary and hasattr(self.qa_bot.results, 'ui_issue_summary'):
-            self.qa_bot.results.ui_issue_summary = self.qa_bot.ui_issue_summary
-            
-        if hasattr(self.qa_bot, 'responsive_issue_summary') and self.qa_bot.responsive_issue_summary and hasattr(self.qa_bot.results, 'responsive_issue_summary'):
-            self.qa_bot.results.responsive_issue_summary = self.qa_bot.responsive_issue_summary
-            
-        if hasattr(self.qa_bot, 'responsiveness_scores') and self.qa_bot.responsiveness_scores and hasattr(self.qa_bot.results, 'responsiveness_scores'):
-            self.qa_bot.results.responsiveness_scores = self.qa_bot.responsiveness_scores
-            
-        if hasattr(self.qa_bot, 'broken_links') and self.qa_bot.broken_links and hasattr(self.qa_bot.results, 'broken_links'):
-            self.qa_bot.results.broken_links = self.qa_bot.broken_links
-            
-        if hasattr(self.qa_bot, 'js_errors') and self.qa_bot.js_errors and hasattr(self.qa_bot.results, 'js_errors'):
-            self.qa_bot.results.js_errors = self.qa_bot.js_errors
+        for attr in _TRANSFER_ATTRS:
+            value = getattr(self.qa_bot, attr, None)
+            if value and hasattr(self.qa_bot.results, attr):
+                setattr(self.qa_bot.results, attr, value)
+        
+        return results
+    
+    def _resolve_url(self, url: str) -> str:
+        """Turn a step URL relative to the flow's base URL into an absolute one"""
+        if url.startswith("http"):
+            return url
+        return f"{self.qa_bot.base_url.rstrip('/')}/{url.lstrip('/')}"
+    
+    def _resolve_step_urls(self, steps: List[Dict]) -> None:
+        """Resolve every navigate step's URL once, before any step runs"""
+        for step in steps:
+            if isinstance(step, dict) and step.get("action") == "navigate":
+                step["_resolved_url"] = self._resolve_url(step.get("url", "/"))
+    
+    def unknown_actions(self, steps: List[Dict]) -> List[Tuple[str, str]]:
+        """Return (step name, action) for each step whose action has no handler"""
+        return [(step.get("name", "Unknown step"), step.get("action", ""))
+                for step in steps if step.get("action", "") not in self._handlers]
+    
+    @staticmethod
+    def _assert_text_runs(steps: List[Dict]) -> Dict[int, List[str]]:
+        """Map the first step of each run of consecutive ungrouped assert_text steps to the run's selectors"""
+        runs = {}
+        run = []
+        for step in steps + [{}]:
+            if step.get("action") == "assert_text" and step.get("group") is None and step.get("selector"):
+                run.append(step)
+                continue
+            if len(run) > 1:
+                runs[id(run[0])] = list(dict.fromkeys(s["selector"] for s in run))
+            run = []
+        return runs
+    
+    async def _read_texts(self, selectors: List[str]) -> Dict[str, str]:
+        """innerText of the first match for each selector, in one page.evaluate; missing elements are left out"""
+        try:
+            texts = await self.qa_bot.page.evaluate(_READ_TEXTS_JS, selectors)
+        except Exception:
+            return {}
+        return {sel: text for sel, text in texts.items() if text is not None}
+    
+    @staticmethod
+    def _batch_steps(steps: List[Dict]):
+        """Yield runs of consecutive steps that share a "group" tag; untagged steps run alone"""
+        batch = []
+        for step in steps:
+            group = step.get("group")
+            if batch and group is not None and batch[-1].get("group") == group:
+                batch.append(step)
+                continue
+            if batch:
+                yield batch
+            batch = [step]
+        if batch:
+            yield batch
+    
+    async def _run_step(self, step: Dict, results: Dict, skip_remaining: bool) -> bool:
+        """
+        Execute a single flow step
+        
+        Args:
+            step: Step definition
+            results: Flow results dictionary
+            skip_remaining: Whether an earlier blocking step has failed
             
-        return results 
\ No newline at end of file
+        Returns:
+            True if this was a blocking step and it failed
+        """
+        importance = step.get("importance", "normal")
+        step_name = step.get("name", "Unknown step")
+        if skip_remaining and importance != "blocking":
+            results["skipped"].append({
+                "step": step.get("name", "Unnamed step"),
+                "reason": "Skipped due to blocking failure",
+                "importance": importance
+            })
+            return False
+        step_start = time.perf_counter()
+        try:
+            # Before executing a step, check if it's a 'navigate to login page' and user is already logged in
+            if step.get('action') == 'navigate' and 'login' in step.get('name', '').lower():
+                if hasattr(self.qa_bot, 'is_logged_in') and await self.qa_bot.is_logged_in():
+                    self.qa_bot.results.passed.append({
+                        'step': step.get('name', 'Navigate to login page'),
+                        'status': 'Skipped (already logged in)'
+                    })
+                    return False
+            handler = self._handlers.get(step.get("action", ""), self._do_unknown)
+            failed_before = len(results["failed"])
+            await handler(step, results, step_name, importance, step_start)
+            # Steps in a group run concurrently, so look for this step's entries rather than the last one
+            own_failures = [f for f in results["failed"][failed_before:] if f.get("step") == step_name]
+            for fail in own_failures:
+                fail["importance"] = importance
+            return bool(own_failures) and importance == "blocking"
+        except Exception as e:
+            # Always include step name and error
+            self._record_failure(results, step_name or "[Step name missing]",
+                                 str(e) or "[No error message provided]", step_start, importance)
+            return importance == "blocking"
+    
+    async def _do_unknown(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        results["skipped"].append({
+            "step": step_name,
+            "reason": f"Unknown action: {step.get('action', '')}",
+            "duration": self._elapsed(step_start),
+            "importance": importance
+        })
+    
+    async def _do_navigate(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        url = step.get("_resolved_url") or self._resolve_url(step.get("url", "/"))
+        ok, success = await self._run_with_retry(
+            lambda: self.qa_bot.navigate_to(url), results, step_name, importance, step_start, "Navigation error")
+        if success:
+            self._record_pass(results, step_name, step_start, importance)
+        elif ok:
+            self._record_failure(results, step_name, "Navigation failed", step_start, importance)
+    
+    async def _do_check_ui(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        ok, _ = await self._run_with_retry(
+            lambda: self.qa_bot.check_ui_elements(), results, step_name, importance, step_start,
+            "UI check error", mirror=True)
+        if ok:
+            self._record_pass(results, step_name, step_start, importance, mirror=True)
+    
+    async def _do_test_responsive(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        url = step.get("url")
+        ok, _ = await self._run_with_retry(
+            lambda: self.qa_bot.test_responsive_design(url=url), results, step_name, importance, step_start,
+            "Responsive test error", mirror=True)
+        if ok:
+            self._record_pass(results, step_name, step_start, importance, mirror=True)
+    
+    async def _do_check_links(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        ok, _ = await self._run_with_retry(
+            lambda: self.qa_bot.check_for_broken_links(), results, step_name, importance, step_start,
+            "Link check error")
+        if ok:
+            self._record_pass(results, step_name, step_start, importance)
+    
+    async def _do_fill_form(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        form_selector = step.get("form_selector", "form")
+        fields = step.get("fields", {})
+        ok, _ = await self._run_with_retry(
+            lambda: self.qa_bot.test_form_submission(form_selector, fields), results, step_name, importance,
+            step_start, "Form fill error")
+        if ok:
+            self._record_pass(results, step_name, step_start, importance)
+    
+    async def _do_click(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        selector = step.get("selector")
+        timeout = step.get("timeout", 10000)
+        page = self.qa_bot.page
+        if not (selector and page):
+            self._record_failure(results, step_name, "Missing selector or page not available", step_start, importance)
+            return
+        
+        async def click():
+            await page.click(selector, timeout=timeout)
+            if step.get("wait_for_navigation", False):
+                await page.wait_for_load_state("networkidle", timeout=15000)
+        
+        xpath_suggestion = _CLASS_XPATH.format(cls=selector.strip('.'))
+        ok, _ = await self._run_with_retry(
+            click, results, step_name, importance, step_start, "Click error",
+            error_suffix=f". XPath suggestion: {xpath_suggestion}", capture_diagnostics=True,
+            retry_timeouts=False, selector=selector)
+        if ok:
+            self._record_pass(results, step_name, step_start, importance)
+    
+    async def _do_wait(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        duration_ms = step.get("duration", 1000)
+        ok, _ = await self._run_with_retry(
+            lambda: self.qa_bot.page.wait_for_timeout(duration_ms), results, step_name, importance, step_start,
+            "Wait error", attempts=1)
+        if ok:
+            self._record_pass(results, step_name, step_start, importance)
+    
+    async def _do_check_element(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        selector = step.get("selector")
+        expected_visible = step.get("visible", True)
+        timeout = step.get("timeout", 10000)
+        page = self.qa_bot.page
+        if not (selector and page):
+            self._record_failure(results, step_name, "Missing selector or page not available", step_start, importance)
+            return
+        xpath_suggestion = _CLASS_XPATH.format(cls=selector.strip('.'))
+        ok, is_visible = await self._run_with_retry(
+            lambda: page.is_visible(selector, timeout=timeout), results, step_name, importance, step_start,
+            "Element check error", error_suffix=f". XPath suggestion: {xpath_suggestion}",
+            capture_diagnostics=True, retry_timeouts=False, selector=selector)
+        if not ok:
+            return
+        if is_visible == expected_visible:
+            self._record_pass(results, step_name, step_start, importance)
+        else:
+            state = "visible" if expected_visible else "invisible"
+            self._record_failure(results, step_name, f"Element should be {state}", step_start, importance)
+    
+    async def _do_check_accessibility(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        ok, violations = await self._run_with_retry(
+            lambda: self.qa_bot.check_accessibility(), results, step_name, importance, step_start,
+            "Accessibility check error", attempts=1)
+        if not ok:
+            return
+        if violations:
+            # Count critical/serious
+            criticals = [v for v in violations if v.get('impact') in ('critical', 'serious')]
+            if criticals:
+                self._record_failure(
+                    results, step_name, f"Accessibility violations: {len(criticals)} critical/serious issues",
+                    step_start, importance, violations=criticals)
+            else:
+                self._record_pass(results, step_name, step_start, importance, violations=violations)
+        else:
+            self._record_pass(results, step_name, step_start, importance)
+    
+    async def _do_assert_text(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        selector = step.get("selector")
+        expected_text = step.get("text")
+        should_exist = step.get("should_exist", True)
+        timeout = step.get("timeout", 10000)
+        if not (selector and expected_text and self.qa_bot.page):
+            self._record_failure(results, step_name, "Missing selector or text for assert_text", step_start, importance)
+            return
+        content = self._prefetched_text.get(selector)
+        try:
+            if content is None:
+                content = await self.qa_bot.page.inner_text(selector, timeout=timeout)
+        except PlaywrightError:
+            # Auto-heal: suggest XPath, screenshot, HTML snippet
+            xpath_suggestion = _TEXT_OR_CLASS_XPATH.format(text=expected_text, cls=selector.strip('.'))
+            self._record_failure(
+                results, step_name, f"Selector '{selector}' not found. XPath suggestion: {xpath_suggestion}",
+                step_start, importance, **await self._capture_diagnostics(step_name, selector))
+            return
+        found = expected_text in content
+        if found == bool(should_exist):
+            self._record_pass(results, step_name, step_start, importance)
+        else:
+            self._record_failure(results, step_name, f"Text '{expected_text}' not found in {selector}", step_start, importance)
+    
+    async def _do_screenshot(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        page = self.qa_bot.page
+        if not page:
+            self._record_failure(results, step_name, "No page available for screenshot", step_start, importance)
+            return
+        
+        async def take_screenshot():
+            screenshot_path = self._screenshot_path(step_name)
+            await page.screenshot(path=screenshot_path, full_page=True)
+            return screenshot_path
+        
+        ok, screenshot_path = await self._run_with_retry(
+            take_screenshot, results, step_name, importance, step_start, "Screenshot error", attempts=1)
+        if ok:
+            self._record_pass(results, step_name, step_start, importance, screenshot=screenshot_path)
+    
+    async def _do_check_performance(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        page = self.qa_bot.page
+        if not page:
+            self._record_failure(results, step_name, "No page available for performance check", step_start, importance)
+            return
+        ok, perf = await self._run_with_retry(
+            lambda: page.evaluate(_PERFORMANCE_JS), results, step_name, importance, step_start, "Performance check error", attempts=1)
+        if ok:
+            self._record_pass(results, step_name, step_start, importance, performance=perf)
+    
+    async def _do_auto_crawl(self, step: Dict, results: Dict, step_name: str, importance: str, step_start: float) -> None:
+        # Auto-crawl logic
+        max_pages = step.get("max_pages", 10)
+        # Support custom nav_selector from flow YAML
+        nav_selector = self._flow_data.get("nav_selector")
+        # Discover links from the current page
+        links = await self.qa_bot.discover_links(max_pages, nav_selector)
+        if not links:
+            results["failed"].append(self._fail(step_name, "No internal links found to crawl", 0, "critical"))
+            return
+        # Visit pages concurrently, each worker on its own page in the shared browser context
+        sem = asyncio.Semaphore(max(1, step.get("concurrency", 4)))
+        crawled = await asyncio.gather(*(self._crawl_one(link, i, sem) for i, link in enumerate(links)))
+        # Record in discovery order, not completion order
+        for passed, failed in crawled:
+            results["passed"].extend(passed)
+            results["failed"].extend(failed)
+    
+    async def _crawl_one(self, link: str, idx: int, sem: asyncio.Semaphore) -> Tuple[List[Dict], List[Dict]]:
+        """Navigate to one crawled link on a worker page and run the UI and responsive checks"""
+        crawl_step_name = f"Crawl Page {idx+1}: {link}"
+        passed, failed = [], []
+        async with sem:
+            crawl_start = time.perf_counter()
+            worker = None
+            try:
+                worker = await self.qa_bot.new_worker()
+                nav_success = await worker.navigate_to(link)
+                nav_duration = self._elapsed(crawl_start)
+                if nav_success:
+                    # UI check
+                    try:
+                        await worker.check_ui_elements()
+                    except Exception as e:
+                        failed.append(self._fail(crawl_step_name + " (UI check)", str(e), nav_duration, "normal"))
+                    # Responsive check
+                    try:
+                        await worker.test_responsive_design(url=link)
+                    except Exception as e:
+                        failed.append(self._fail(crawl_step_name + " (Responsive check)", str(e), nav_duration, "normal"))
+                    passed.append({
+                        "step": crawl_step_name,
+                        "url": link,
+                        "duration": nav_duration,
+                        "importance": "normal"
+                    })
+                else:
+                    failed.append(self._fail(crawl_step_name, "Navigation failed", nav_duration, "normal", url=link))
+            except Exception as e:
+                failed.append(self._fail(crawl_step_name, str(e), self._elapsed(crawl_start), "normal", url=link))
+            finally:
+                if worker is not None:
+                    try:
+                        await worker.page.close()
+                    except Exception:
+                        pass
+        return passed, failed
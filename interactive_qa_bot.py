@@ -1,9 +1,12 @@
 import os
 import sys
 from pathlib import Path
-from flow_manager import FlowManager
 import subprocess
 
+# Set QA_BOT_ISOLATED=1 to run each test in a separate Python process instead of in the menu's process
+ISOLATED = os.environ.get("QA_BOT_ISOLATED") == "1"
+ENVIRONMENTS = ("prod", "uat")
+
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
@@ -15,48 +18,47 @@ def get_login_credentials():
         return username, password
     return '', ''
 
+def launch_flow(url, flow_name, environment, username, password):
+    if ISOLATED:
+        cmd = [sys.executable, "qa_bot.py", "run-flow", url, flow_name, "--environment", environment]
+        if username:
+            cmd += ["--username", username]
+        if password:
+            cmd += ["--password", password]
+        print(f"[INFO] Running: {' '.join(cmd)}")
+        # The child inherits the terminal, so its output and prompts appear as it runs
+        result = subprocess.run(cmd)
+        if result.returncode == 0:
+            print("[SUCCESS] Flow completed.")
+        else:
+            print(f"[ERROR] Flow failed with exit code {result.returncode}.")
+        return
+    # Imported on first use so the menu starts without loading Playwright
+    import qa_bot
+    print(f"[INFO] Running flow '{flow_name}' ({environment}) on {url}")
+    try:
+        qa_bot.run_flow(url, flow_name, environment=environment, username=username, password=password,
+                        headless=None, skip_login=not username, report=True, fast=False)
+        print("[SUCCESS] Flow completed.")
+    except Exception as e:
+        print(f"[ERROR] Flow failed: {e}")
+
 def run_full_test():
     clear_screen()
     url = input("Enter website URL: ").strip()
     flow_name = "temp_full_site_test"  # Always use your full-site flow
     environment = "prod"
     username, password = get_login_credentials()
-    cmd = [sys.executable, "qa_bot.py", "run-flow", url, flow_name, "--environment", environment]
-    if username:
-        cmd += ["--username", username]
-    if password:
-        cmd += ["--password", password]
-    print(f"[INFO] Running: {' '.join(cmd)}")
-    try:
-        result = subprocess.run(cmd, check=True)
-        if result.returncode == 0:
-            print("[SUCCESS] Flow completed.")
-        else:
-            print(f"[ERROR] Flow failed with exit code {result.returncode}.")
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Flow failed: {e}")
+    launch_flow(url, flow_name, environment, username, password)
     input("Press Enter to continue...")
 
 def run_test_flow():
     clear_screen()
     url = input("Enter website URL: ").strip()
-    flow_name = input("Enter flow name (YAML file without .yaml): ").strip()
+    flow_name = input("Enter flow name (file name without .json/.yaml): ").strip()
     environment = input("Enter environment (prod/uat): ").strip() or "prod"
     username, password = get_login_credentials()
-    cmd = [sys.executable, "qa_bot.py", "run-flow", url, flow_name, "--environment", environment]
-    if username:
-        cmd += ["--username", username]
-    if password:
-        cmd += ["--password", password]
-    print(f"[INFO] Running: {' '.join(cmd)}")
-    try:
-        result = subprocess.run(cmd, check=True)
-        if result.returncode == 0:
-            print("[SUCCESS] Flow completed.")
-        else:
-            print(f"[ERROR] Flow failed with exit code {result.returncode}.")
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Flow failed: {e}")
+    launch_flow(url, flow_name, environment, username, password)
     input("Press Enter to continue...")
 
 def create_new_flow():
@@ -64,28 +66,63 @@ def create_new_flow():
     flow_name = input("Enter new flow name: ").strip()
     environment = input("Enter environment (prod/uat): ").strip() or "prod"
     description = input("Enter plain English description of the flow: ").strip()
-    cmd = [sys.executable, "qa_bot.py", "generate-flow", flow_name, "--environment", environment, "--description", description]
-    print(f"[INFO] Running: {' '.join(cmd)}")
-    subprocess.run(cmd)
+    if ISOLATED:
+        cmd = [sys.executable, "qa_bot.py", "generate-flow", flow_name, "--environment", environment, "--description", description]
+        print(f"[INFO] Running: {' '.join(cmd)}")
+        subprocess.run(cmd)
+    else:
+        import qa_bot
+        try:
+            qa_bot.generate_flow(flow_name, environment=environment, description=description)
+        except Exception as e:
+            print(f"[ERROR] Could not generate flow: {e}")
     input("Press Enter to continue...")
 
+# Last scan_flows() result and the directory mtimes it was taken at
+_flow_scan = {"key": None, "flows": {}}
+
+def scan_flows():
+    """Return {environment: [flow file paths]}, rescanning only when a flows directory has changed"""
+    flows_dir = Path("flows")
+    dirs = [flows_dir] + [flows_dir / env for env in ENVIRONMENTS]
+    key = []
+    for d in dirs:
+        try:
+            key.append(d.stat().st_mtime_ns)
+        except FileNotFoundError:
+            key.append(None)
+    key = tuple(key)
+    if key != _flow_scan["key"]:
+        flows = {}
+        for env in ENVIRONMENTS:
+            paths = []
+            try:
+                with os.scandir(flows_dir / env) as entries:
+                    for entry in entries:
+                        if os.path.splitext(entry.name)[1].lower() in (".json", ".yaml") and entry.is_file():
+                            paths.append(flows_dir / env / entry.name)
+            except FileNotFoundError:
+                pass
+            # load_flow prefers JSON; hide a stale YAML copy so the editor only offers the file that runs
+            json_stems = {p.stem for p in paths if p.suffix.lower() == ".json"}
+            flows[env] = sorted(p for p in paths if p.suffix.lower() == ".json" or p.stem not in json_stems)
+        _flow_scan["key"], _flow_scan["flows"] = key, flows
+    return _flow_scan["flows"]
+
 def list_flows():
     clear_screen()
-    fm = FlowManager()
-    flows = fm.list_flows("prod")
-    print("\nAvailable flows in 'prod':")
-    for f in flows.get("prod", []):
-        print(f"- {f}")
-    flows = fm.list_flows("uat")
-    print("\nAvailable flows in 'uat':")
-    for f in flows.get("uat", []):
-        print(f"- {f}")
+    flows = scan_flows()
+    for env in ENVIRONMENTS:
+        print(f"\nAvailable flows in '{env}':")
+        # A flow may exist as both legacy YAML and JSON
+        for f in sorted({p.stem for p in flows[env]}):
+            print(f"- {f}")
     input("Press Enter to continue...")
 
 def edit_flow():
     clear_screen()
     flows_dir = Path("flows")
-    all_flows = list(flows_dir.glob("**/*.yaml"))
+    all_flows = [p for env in ENVIRONMENTS for p in scan_flows()[env]]
     if not all_flows:
         print("No flows found.")
         input("Press Enter to continue...")
@@ -3,8 +3,12 @@
 AI-Powered End-to-End QA Testing Bot for Websites
 """
 import asyncio
+import copy
+import hashlib
 import json
 import os
+import subprocess
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
@@ -13,17 +17,17 @@ from typing import Dict, List, Optional, Union
 import typer
 from loguru import logger
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Response
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from pydantic import BaseModel
 from rich.console import Console
-from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
-import yaml
 import ssl
 import socket
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qsl
 import re
 import builtins
+from collections import defaultdict
 
 # Import flow manager components
 from flow_manager import FlowManager, FlowExecutor
@@ -33,6 +37,104 @@ logger.remove()
 logger.add("qa_bot.log", rotation="10 MB")
 
 console = Console()
+# A form field value that is just a template variable, e.g. {{username}}
+_TEMPLATE_VAR_RE = re.compile(r'\{\{(\w+)\}\}')
+# Submit buttons tried by test_form_submission, in priority order, scoped to the form being tested
+_SUBMIT_SELECTORS = (
+    "button[type='submit']", "input[type='submit']",
+    "button.btn-outline-primary", "button.login-button",
+    ".login-form button", "form button"
+)
+# Input attributes that suggest a username/email field on a login form
+_LOGIN_ATTR_RE = re.compile(r'user|email|login', re.IGNORECASE)
+# First selector in a list with a visible match (non-empty box, not visibility:hidden), or null
+_FIRST_VISIBLE_SELECTOR_JS = """
+    (sels) => sels.find(s => Array.from(document.querySelectorAll(s)).some(el => {
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    })) || null
+"""
+# Elements that are usually the fixed-position ones (bars, banners, overlays, widgets injected at the top of body);
+# only these get the getComputedStyle check instead of every node on the page
+_FIXED_CANDIDATES_SELECTOR = (
+    "body > *, header, footer, nav, aside, [style*='fixed'], [class*='fixed'], [class*='sticky'], "
+    "[class*='overlay'], [class*='modal'], [class*='banner']"
+)
+# All responsive-design checks for the current viewport in a single round-trip. The viewport meta tag
+# does not change with the window size, so it is only looked up when checkMeta is set.
+# Image and fixed-element styles can change with media queries and are checked every time; only their counts
+# and the first few examples are sent back.
+_RESPONSIVE_CHECKS_JS = """
+    async ({candidates, checkMeta}) => {
+        // Let resize handlers and the next layout run after the viewport change (capped in case rAF is throttled)
+        await Promise.race([
+            new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r))),
+            new Promise(r => setTimeout(r, 100))
+        ]);
+        const root = document.documentElement;
+        const hasViewport = checkMeta ? !!document.querySelector('meta[name=viewport]') : null;
+        const hasHScroll = root.scrollWidth > root.clientWidth + 2;
+        const imgs = [];
+        let imgCount = 0;
+        for (const img of document.images) {
+            const style = getComputedStyle(img);
+            if (style.maxWidth !== '100%' && style.width !== '100%' && imgCount++ < 5) imgs.push(img.src);
+        }
+        const fixed = [];
+        let fixedCount = 0;
+        for (const el of document.querySelectorAll(candidates)) {
+            const style = getComputedStyle(el);
+            if (style.position === 'fixed' && parseFloat(style.width) > 100 && parseFloat(style.height) > 40 && fixedCount++ < 5) {
+                fixed.push(el.tagName + (el.id ? '#' + el.id : ''));
+            }
+        }
+        return {hasViewport, hasHScroll, imgs, imgCount, fixed, fixedCount};
+    }
+"""
+# Installed on every page before its own scripts run, so collect_performance_metrics only has to read window.__lcp
+_LCP_OBSERVER_JS = """
+    try {
+        new PerformanceObserver((entryList) => {
+            const entries = entryList.getEntries();
+            window.__lcp = entries[entries.length - 1];
+        }).observe({type: 'largest-contentful-paint', buffered: true});
+    } catch (e) {}
+"""
+# Sentence boundaries in a generate-flow description
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+# generate-flow keyword rules, tried in this order (not by position in the sentence), in a single regex pass
+_FLOW_KEYWORD_RE = re.compile(
+    r"(?s)(?=.*(?P<login>login))|(?=.*(?P<navigate>navigate))|(?=.*(?P<check_ui>check ui))|(?=.*(?P<responsive>responsive))",
+    re.IGNORECASE
+)
+# Step each generate-flow keyword rule produces (add more mappings as needed). The same dict is
+# appended for every matching sentence; JSON serialization writes each occurrence out in full.
+_FLOW_STEP_TEMPLATES = {
+    "login": {
+        "name": "Login",
+        "action": "fill_form",
+        "form_selector": "form",
+        "fields": {
+            "input[name='username']": "{{username}}",
+            "input[name='password']": "{{password}}"
+        }
+    },
+    "navigate": {
+        "name": "Navigate",
+        "action": "navigate",
+        "url": "/"
+    },
+    "check_ui": {
+        "name": "Check UI",
+        "action": "check_ui"
+    },
+    "responsive": {
+        "name": "Test Responsive Design",
+        "action": "test_responsive"
+    },
+}
+
+
 app = typer.Typer(help="AI-Powered End-to-End QA Testing Bot for Websites")
 
 
@@ -68,17 +170,27 @@ class TestResults(BaseModel):
 class QABot:
     """AI-Powered QA Testing Bot for Websites"""
     
-    def __init__(self, headless: bool = True):
+    # Saved login sessions (cookies + localStorage), reused while younger than SESSION_MAX_AGE seconds
+    SESSION_DIR = Path(".qabot_state")
+    SESSION_MAX_AGE = 3600
+    # Resource types skipped in fast mode; stylesheets still load because visibility and responsive checks need CSS
+    FAST_MODE_BLOCKED = ("image", "media", "font")
+
+    def __init__(self, headless: bool = True, fast_mode: bool = False):
         self.headless = headless
+        self.fast_mode = fast_mode
+        # QA_BOT_DEBUG=1 turns on verbose page dumps (e.g. the login form HTML)
+        self.debug = os.environ.get("QA_BOT_DEBUG") == "1"
         self.results = None
         self.browser = None
         self.context = None
         self.page = None
         self.base_url = None
-        self.visited_urls = set()
+        self.visited_urls = set()  # normalized with _normalize_url
         self.js_errors = []
         self.ui_checked_pages = set()
-        self.responsive_checked_pages = set()
+        self.responsive_checked_pages = set()  # normalized with _normalize_url
+        self._ssl_cache = {}  # (hostname, port) -> certificate status
         self.credentials = None  # Store credentials for use in form submission
 
     async def setup(self):
@@ -106,7 +218,10 @@ class QABot:
             ])
         
         self.browser = await browser_type.launch(**launch_options)
-        
+        await self._open_context()
+
+    async def _open_context(self, storage_state: str = None):
+        """Create the browser context and main page, optionally restoring a saved login session"""
         # Configure browser context
         context_options = {
             "viewport": {"width": 1920, "height": 1080},
@@ -115,8 +230,13 @@ class QABot:
             "bypass_csp": True,  # Bypass Content Security Policy for testing
             "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
         }
+        if storage_state:
+            context_options["storage_state"] = storage_state
         
         self.context = await self.browser.new_context(**context_options)
+        await self.context.add_init_script(_LCP_OBSERVER_JS)
+        if self.fast_mode:
+            await self.context.route("**/*", self._block_heavy_resources)
         
         # Create page and set up listeners
         self.page = await self.context.new_page()
@@ -126,7 +246,32 @@ class QABot:
         # Set default timeouts
         self.page.set_default_timeout(30000)  # 30 seconds
         self.page.set_default_navigation_timeout(30000)
-        
+
+    async def _block_heavy_resources(self, route):
+        """Route handler for fast mode: abort images, media and fonts, let everything else through"""
+        if route.request.resource_type in self.FAST_MODE_BLOCKED:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def new_worker(self):
+        """Return a copy of the bot driving its own page in the shared browser context.
+
+        The copy shares results, visited pages and the logged-in session with this bot,
+        so several pages can be checked concurrently. Close worker.page when done.
+        """
+        worker = copy.copy(self)
+        worker.page = await self.context.new_page()
+        worker.page.on("console", worker._handle_console_message)
+        worker.page.on("pageerror", worker._handle_page_error)
+        worker.page.set_default_timeout(30000)
+        worker.page.set_default_navigation_timeout(30000)
+        return worker
+
+    async def _html_snippet(self, length: int = 1000) -> str:
+        """First `length` characters of the page HTML, sliced in the browser so the whole DOM is not transferred"""
+        return await self.page.evaluate("(n) => document.documentElement.outerHTML.slice(0, n)", length)
+
     async def _handle_console_message(self, msg):
         """Handle console messages"""
         if msg.type == "error":
@@ -145,7 +290,7 @@ class QABot:
         logger.error(f"Page error on {self.page.url}: {error}")
         
     async def find_and_login_homepage(self, url: str, credentials: LoginCredentials, post_login_selector: str = '#main-menu-navigation') -> bool:
-        """Robust login for CSRF/session-protected forms: waits for form, fills only username/password, submits by pressing Enter and clicking, with debug output."""
+        """Robust login for CSRF/session-protected forms: waits for form, fills only username/password, submits once via the submit button (or Enter), with debug output."""
         try:
             await self.page.goto(url, timeout=60000)
             await self.page.wait_for_load_state("domcontentloaded")
@@ -159,103 +304,91 @@ class QABot:
             password_selectors = [
                 "input#password", "input[name='password']", "input[type='password']", "input[id='password']"
             ]
-            for sel in username_selectors:
-                try:
-                    await self.page.wait_for_selector(sel, timeout=5000)
-                    username_selector = sel
-                    break
-                except Exception:
-                    continue
-            for sel in password_selectors:
-                try:
-                    await self.page.wait_for_selector(sel, timeout=5000)
-                    password_selector = sel
-                    break
-                except Exception:
-                    continue
+            username_selector = await self._first_visible_selector(username_selectors)
+            password_selector = await self._first_visible_selector(password_selectors)
             if not username_selector or not password_selector:
                 print(f'[DEBUG] Username or password field not found. Username selector: {username_selector}, Password selector: {password_selector}')
                 return False
-            username_el = await self.page.query_selector(username_selector)
-            form = await username_el.evaluate_handle('el => el.closest("form")')
-            if form:
-                form_html = await form.evaluate('el => el.outerHTML')
+            # Resolve each field once and reuse the locator for every action on it
+            user_loc = self.page.locator(username_selector).first
+            pwd_loc = self.page.locator(password_selector).first
+            form = await user_loc.evaluate_handle('el => el.closest("form")')
+            if self.debug:
+                form_html = await form.evaluate('el => el ? el.outerHTML : null')
                 print(f'[DEBUG] Login form HTML before filling:\n{form_html}')
-            await self.page.fill(username_selector, credentials.username)
-            await self.page.wait_for_timeout(300)  # Mimic human typing delay
-            await self.page.fill(password_selector, credentials.password)
-            await self.page.wait_for_timeout(300)  # Mimic human typing delay
-            if form:
-                form_html_after = await form.evaluate('el => el.outerHTML')
-                print(f'[DEBUG] Login form HTML after filling:\n{form_html_after}')
-            # Try both pressing Enter and clicking the first visible/enabled submit button in parallel
+            await user_loc.fill(credentials.username)
+            await pwd_loc.fill(credentials.password)
+            # Candidate submit buttons, in priority order
             submit_selectors = [
                 "button[type='submit']", "input[type='submit']", "button.btn-outline-primary", "button.login-button", ".login-form button", "form button", "button", ".btn", ".login-btn"
             ]
-            found_buttons = []
             click_task = None
-            for sel in submit_selectors:
-                buttons = await self.page.query_selector_all(sel)
-                for btn in buttons:
-                    try:
-                        is_in_form = await btn.evaluate('(el, form) => form && el.closest("form") === form', form)
-                        if not is_in_form:
-                            continue
-                        visible = await btn.is_visible()
-                        enabled = await btn.is_enabled()
-                        text = await btn.inner_text() if hasattr(btn, 'inner_text') else ''
-                        found_buttons.append((sel, text, visible, enabled))
-                        if visible and enabled and not click_task:
-                            print(f'[DEBUG] Clicking submit button with selector: {sel}, text: {text}')
-                            click_task = btn.click()
-                            break
-                    except Exception as e:
-                        print(f'[DEBUG] Error with button {sel}: {str(e)}')
-                        continue
-                if click_task:
-                    break
-            # Run both pressing Enter and clicking the button in parallel
-            enter_task = self.page.focus(password_selector)
-            await enter_task
-            # Use asyncio.gather to run both tasks in parallel
-            import asyncio
-            results = await asyncio.gather(
-                self.page.keyboard.press('Enter'),
-                click_task if click_task else asyncio.sleep(0),
-                return_exceptions=True
-            )
-            # Wait for either post-login selector or AJAX login (networkidle or DOM change)
+            # Find the first visible, enabled button inside the login form in one round-trip
+            try:
+                button = await form.evaluate("""
+                    (form, sels) => {
+                        if (!form) return null;
+                        for (const sel of sels) {
+                            const matches = document.querySelectorAll(sel);
+                            for (let i = 0; i < matches.length; i++) {
+                                const b = matches[i];
+                                if (b.closest('form') !== form) continue;
+                                const r = b.getBoundingClientRect();
+                                if (r.width > 0 && r.height > 0 && getComputedStyle(b).visibility !== 'hidden' && !b.matches(':disabled')) {
+                                    return {selector: sel, index: i, text: b.innerText || ''};
+                                }
+                            }
+                        }
+                        return null;
+                    }
+                """, submit_selectors)
+            except Exception as e:
+                print(f'[DEBUG] Error finding submit button: {str(e)}')
+                button = None
+            if button:
+                print(f"[DEBUG] Clicking submit button with selector: {button['selector']}, text: {button['text']}")
+                click_task = self.page.locator(button['selector']).nth(button['index']).click()
+            # Submit once: click the form's submit button, or press Enter in the password field.
+            # Doing both raced two submissions against each other.
+            submitted = False
+            if click_task:
+                try:
+                    await click_task
+                    submitted = True
+                except Exception as e:
+                    print(f'[DEBUG] Submit button click failed, pressing Enter instead: {str(e)}')
+            if not submitted:
+                await pwd_loc.press('Enter')
+            # The selector wait covers both full-page and AJAX logins
+            local_storage_js = '() => { let out = {}; for (let i=0; i<localStorage.length; ++i) { let k = localStorage.key(i); out[k] = localStorage.getItem(k); } return out; }'
             try:
-                await self.page.wait_for_selector(post_login_selector, state='visible', timeout=8000)
+                await self.page.wait_for_selector(post_login_selector, state='visible', timeout=10000)
                 print(f'[DEBUG] Login successful: Found post-login selector {post_login_selector}')
                 cookies = await self.context.cookies()
                 print(f'[DEBUG] Cookies after login: {cookies}')
-                local_storage = await self.page.evaluate('() => { let out = {}; for (let i=0; i<localStorage.length; ++i) { let k = localStorage.key(i); out[k] = localStorage.getItem(k); } return out; }')
+                local_storage = await self.page.evaluate(local_storage_js)
                 print(f'[DEBUG] localStorage after login: {local_storage}')
                 return True
             except Exception:
-                print(f'[DEBUG] Login failed: Post-login selector {post_login_selector} not found, checking for AJAX login...')
-                try:
-                    await self.page.wait_for_load_state('networkidle', timeout=5000)
-                    await self.page.wait_for_selector(post_login_selector, state='visible', timeout=5000)
-                    print(f'[DEBUG] Login successful (AJAX fallback): Found post-login selector {post_login_selector}')
-                    cookies = await self.context.cookies()
-                    print(f'[DEBUG] Cookies after login: {cookies}')
-                    local_storage = await self.page.evaluate('() => { let out = {}; for (let i=0; i<localStorage.length; ++i) { let k = localStorage.key(i); out[k] = localStorage.getItem(k); } return out; }')
-                    print(f'[DEBUG] localStorage after login: {local_storage}')
-                    return True
-                except Exception:
-                    print(f'[DEBUG] Login failed: All robust login attempts exhausted')
-                    cookies = await self.context.cookies()
-                    print(f'[DEBUG] Cookies after failed login: {cookies}')
-                    local_storage = await self.page.evaluate('() => { let out = {}; for (let i=0; i<localStorage.length; ++i) { let k = localStorage.key(i); out[k] = localStorage.getItem(k); } return out; }')
-                    print(f'[DEBUG] localStorage after failed login: {local_storage}')
-                    return False
+                print(f'[DEBUG] Login failed: Post-login selector {post_login_selector} not found')
+                cookies = await self.context.cookies()
+                print(f'[DEBUG] Cookies after failed login: {cookies}')
+                local_storage = await self.page.evaluate(local_storage_js)
+                print(f'[DEBUG] localStorage after failed login: {local_storage}')
+                return False
         except Exception as e:
             logger.error(f"Homepage login attempt failed: {str(e)}")
             print(f'[DEBUG] Homepage login attempt failed: {str(e)}')
             return False
 
+    async def _first_visible_selector(self, selectors: List[str], timeout: int = 5000) -> Optional[str]:
+        """Wait once for any of the selectors to be visible, then return the first one in list order that is"""
+        try:
+            await self.page.wait_for_selector(", ".join(selectors), state='visible', timeout=timeout)
+        except Exception:
+            return None
+        return await self.page.evaluate(_FIRST_VISIBLE_SELECTOR_JS, selectors)
+
     async def try_login(self, url: str, credentials: LoginCredentials, post_login_selector: str = '#main-menu-navigation') -> bool:
         """Try to login using homepage first, then multiple strategies. Return True if login succeeds, False otherwise."""
         homepage_login = await self.find_and_login_homepage(url, credentials, post_login_selector=post_login_selector)
@@ -278,36 +411,52 @@ class QABot:
 
     async def check_ssl(self, url: str) -> Dict[str, str]:
         """Check SSL certificate status using direct socket/ssl (not Playwright)"""
-        ssl_status = {"status": "unknown", "expiry": "unknown"}
         try:
             parsed = urlparse(url)
-            hostname = parsed.hostname
-            port = parsed.port or 443
-            context = ssl.create_default_context()
-            with socket.create_connection((hostname, port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    cert = ssock.getpeercert()
-                    issuer = dict(x[0] for x in cert['issuer'])
-                    not_after = cert['notAfter']
-                    ssl_status = {
-                        "status": "valid",
-                        "issuer": issuer.get('organizationName', str(issuer)),
-                        "expiry": not_after
-                    }
+            key = (parsed.hostname, parsed.port or 443)
+            if key in self._ssl_cache:
+                return dict(self._ssl_cache[key])
+            # Blocking socket/TLS work runs in a thread so the event loop keeps going
+            ssl_status = await asyncio.to_thread(self._read_certificate, *key)
+            # Only successful lookups are cached; errors may be transient
+            self._ssl_cache[key] = ssl_status
+            return dict(ssl_status)
         except Exception as e:
-            ssl_status = {"status": "error", "message": str(e)}
-        return ssl_status
+            return {"status": "error", "message": str(e)}
+
+    @staticmethod
+    def _read_certificate(hostname: str, port: int) -> Dict[str, str]:
+        """Open a TLS connection and summarize the server certificate"""
+        context = ssl.create_default_context()
+        with socket.create_connection((hostname, port), timeout=10) as sock:
+            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                cert = ssock.getpeercert()
+                issuer = dict(x[0] for x in cert['issuer'])
+                return {
+                    "status": "valid",
+                    "issuer": issuer.get('organizationName', str(issuer)),
+                    "expiry": cert['notAfter']
+                }
 
     def _append_warning(self, step, reason):
-        if not hasattr(self.results, 'warnings'):
-            self.results.warnings = []
         self.results.warnings.append({"step": step, "reason": reason})
 
+    @staticmethod
+    def _normalize_url(url: str) -> tuple:
+        """Key for visited_urls: ignores fragments, a trailing slash, host case and query parameter order"""
+        parsed = urlparse(url)
+        return (parsed.scheme.lower(), parsed.netloc.lower(), parsed.path.rstrip('/') or '/',
+                tuple(sorted(parse_qsl(parsed.query, keep_blank_values=True))))
+
     async def navigate_to(self, url: str) -> bool:
         """Navigate to a specific URL and check for issues, with robust error/status logging and content verification."""
-        if url in self.visited_urls:
-            return True
+        visit_key = self._normalize_url(url)
         try:
+            # In-page anchors make no request and are recorded every time; visit_key drops the
+            # fragment, so only check visited_urls for real page loads
+            is_anchor = url.startswith('#') or (url.startswith(self.base_url) and '#' in url and url.split('#')[1])
+            if not is_anchor and visit_key in self.visited_urls:
+                return True
             page_name = url.split('/')[-1]
             if not page_name:
                 page_name = "Home"
@@ -316,7 +465,7 @@ class QABot:
             test_name = f"Page Navigation: {page_name}"
             console.print(f"[blue]RUNNING TEST: {test_name}[/blue]")
             console.print(f"[blue]Navigating to {url}...[/blue]")
-            if url.startswith('#') or (url.startswith(self.base_url) and '#' in url and url.split('#')[1]):
+            if is_anchor:
                 self.results.passed.append({
                     "step": test_name,
                     "url": url,
@@ -325,25 +474,47 @@ class QABot:
                 })
                 console.print(f"[green]✓ {test_name} - Anchor navigation (no HTTP request)[/green]")
                 return True
-            start_time = time.time()
-            response = await self.page.goto(url, wait_until='networkidle', timeout=500000)
-            await self.page.wait_for_timeout(5000)
-            load_time = time.time() - start_time
-            self.visited_urls.add(url)
-            final_url = self.page.url
-            status = response.status if response else 0
-            # Check for redirect to login or error page
-            redirected_to_login = 'login' in final_url.lower() and not url.lower().endswith('login')
-            # Check for main content area
+            start_time = time.perf_counter()
+            # Return as soon as the response starts; a slow document still gets the content wait below
+            try:
+                response = await self.page.goto(url, wait_until='commit', timeout=15000)
+            except PlaywrightTimeoutError:
+                # No response at all: the previous document is still loaded, so the content checks
+                # below would judge the old page. Fail here and leave the URL out of visited_urls
+                load_time = time.perf_counter() - start_time
+                self.results.failed.append({
+                    "step": test_name,
+                    "url": url,
+                    "reason": "Navigation failed: no response within 15s",
+                    "final_url": self.page.url,
+                    "load_time": round(load_time, 2),
+                    "main_content_found": False,
+                    "issues": [{"severity": "Critical", "message": "Navigation failed: no response within 15s"}]
+                })
+                console.print(f"[red]✗ {test_name} - Failed: no response within 15s[/red]")
+                return False
+            try:
+                await self.page.wait_for_load_state('domcontentloaded', timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
+            # Wait for any main content area to render instead of sleeping a fixed time
             main_content_found = False
             main_content_selectors = ['.main-content', '.content', '#main-menu-navigation', 'main', '.content-wrapper']
-            for sel in main_content_selectors:
+            try:
+                await self.page.wait_for_selector(", ".join(main_content_selectors), state='visible', timeout=10000)
+                main_content_found = True
+            except Exception:
+                # One evaluate checks every selector instead of an is_visible round-trip each
                 try:
-                    if await self.page.is_visible(sel):
-                        main_content_found = True
-                        break
+                    main_content_found = await self.page.evaluate(_FIRST_VISIBLE_SELECTOR_JS, main_content_selectors) is not None
                 except Exception:
-                    continue
+                    main_content_found = False
+            load_time = time.perf_counter() - start_time
+            self.visited_urls.add(visit_key)
+            final_url = self.page.url
+            status = response.status if response else 0
+            # Check for redirect to login or error page
+            redirected_to_login = 'login' in final_url.lower() and not url.lower().endswith('login')
             # --- ENHANCED: Stop if redirected to login page ---
             if redirected_to_login:
                 self.results.failed.append({
@@ -359,7 +530,6 @@ class QABot:
                 return False
             # --- ENHANCED: Stop if main content not found ---
             if not main_content_found:
-                error_html = await self.page.content()
                 self.results.failed.append({
                     "step": test_name,
                     "url": url,
@@ -401,37 +571,41 @@ class QABot:
 
     async def inspect_login_page(self, url: str, use_ai: bool = True, ai_api_key: str = None) -> Dict[str, str]:
         """Inspect login page and suggest selectors (advanced heuristics + optional AI/ML for best accuracy)."""
-        import re
         try:
             console.print(f"[bold blue]Inspecting login page at {url}...[/bold blue]")
             if self.page.url != url:
                 await self.page.goto(url)
-            forms = await self.page.query_selector_all('form')
+            # Read every form input's attributes in one round-trip and score them here
+            candidates = await self.page.evaluate("""
+                () => Array.from(document.querySelectorAll('form input')).map(i => ({
+                    type: i.getAttribute('type') || '',
+                    name: i.getAttribute('name') || '',
+                    id: i.getAttribute('id') || '',
+                    placeholder: i.getAttribute('placeholder') || '',
+                    aria: i.getAttribute('aria-label') || ''
+                }))
+            """)
             best_guess = {"username": None, "password": None, "submit": None}
             best_score = -1
-            for form in forms:
-                # Find all inputs in the form
-                inputs = await form.query_selector_all('input')
-                for inp in inputs:
-                    inp_type = (await inp.get_attribute('type') or '').lower()
-                    inp_name = (await inp.get_attribute('name') or '').lower()
-                    inp_id = (await inp.get_attribute('id') or '').lower()
-                    inp_placeholder = (await inp.get_attribute('placeholder') or '').lower()
-                    inp_aria = (await inp.get_attribute('aria-label') or '').lower()
-                    score = 0
-                    if inp_type in ['email', 'text']:
-                        score += 2
-                    if re.search(r'user|email|login', inp_name):
-                        score += 4
-                    if re.search(r'user|email|login', inp_id):
-                        score += 3
-                    if re.search(r'user|email|login', inp_placeholder):
-                        score += 2
-                    if re.search(r'user|email|login', inp_aria):
-                        score += 2
-                    if score > best_score:
-                        best_guess['username'] = inp
-                        best_score = score
+            best_index = None
+            for idx, inp in enumerate(candidates):
+                score = 0
+                if inp['type'].lower() in ['email', 'text']:
+                    score += 2
+                if _LOGIN_ATTR_RE.search(inp['name']):
+                    score += 4
+                if _LOGIN_ATTR_RE.search(inp['id']):
+                    score += 3
+                if _LOGIN_ATTR_RE.search(inp['placeholder']):
+                    score += 2
+                if _LOGIN_ATTR_RE.search(inp['aria']):
+                    score += 2
+                if score > best_score:
+                    best_index = idx
+                    best_score = score
+            if best_index is not None:
+                # Only the winning input needs an element handle
+                best_guess['username'] = await self.page.locator('form input').nth(best_index).element_handle()
             return best_guess
         except Exception as e:
             console.print(f"[red]Error inspecting login page: {str(e)}[/red]")
@@ -449,53 +623,53 @@ class QABot:
             sidebar_container = await self.page.query_selector('#main-menu-navigation')
             if not sidebar_container:
                 console.print("[yellow]Sidebar container #main-menu-navigation not found! Printing DOM for debugging:[/yellow]")
-                dom = await self.page.content()
-                logger.warning(f"Sidebar container missing DOM snapshot (truncated): {dom[:1000]}")
+                dom = await self._html_snippet()
+                logger.warning(f"Sidebar container missing DOM snapshot (truncated): {dom}")
                 return []
             # 1. Click all expanders to reveal submenus
             expanders = await sidebar_container.query_selector_all('li.nav-item.has-sub > a')
-            for idx, expander in enumerate(expanders):
-                try:
-                    exp_text = await expander.inner_text() if hasattr(expander, 'inner_text') else ''
-                    print(f"[DEBUG] Expanding sidebar expander {idx}: text='{exp_text}'")
-                    logger.info(f"Expanding sidebar expander {idx}: text='{exp_text}'")
-                    await expander.click()
-                    await self.page.wait_for_timeout(1200)  # Wait for submenu to appear
-                except Exception as e:
+            expander_texts = await sidebar_container.eval_on_selector_all(
+                'li.nav-item.has-sub > a', "(els) => els.map(a => a.innerText)")
+            for idx, exp_text in enumerate(expander_texts):
+                print(f"[DEBUG] Expanding sidebar expander {idx}: text='{exp_text}'")
+                logger.info(f"Expanding sidebar expander {idx}: text='{exp_text}'")
+            # Fire all expander clicks together, then wait once for submenus instead of 1.2s per expander
+            click_results = await asyncio.gather(*(expander.click() for expander in expanders), return_exceptions=True)
+            for e in click_results:
+                if isinstance(e, Exception):
                     logger.warning(f"Sidebar expander click error: {str(e)}")
-            # 2. Collect all submenu links
-            submenu_links = await sidebar_container.query_selector_all('ul.menu-content li > a')
-            for idx, subel in enumerate(submenu_links):
+            if expanders:
                 try:
-                    sub_text = await subel.inner_text() if hasattr(subel, 'inner_text') else ''
-                    sub_href = await subel.get_attribute('href') or await subel.get_attribute('data-href') or ''
-                    print(f"[DEBUG] Submenu element {idx}: text='{sub_text}', href='{sub_href}'")
-                    logger.info(f"Submenu element {idx}: text='{sub_href}'")
-                    if sub_href and sub_href not in links and (sub_href.startswith(self.base_url) or sub_href.startswith('/')):
+                    await sidebar_container.wait_for_selector('ul.menu-content li > a', state='visible', timeout=2000)
+                except Exception:
+                    pass
+            # 2-3. Read all submenu and direct sidebar links (not expanders) in one round-trip
+            items = await sidebar_container.evaluate("""
+                (el) => {
+                    const read = (sel) => Array.from(el.querySelectorAll(sel)).map(a => ({
+                        text: a.innerText,
+                        href: a.getAttribute('href') || a.getAttribute('data-href') || ''
+                    }));
+                    return {
+                        submenu: read('ul.menu-content li > a'),
+                        direct: read('li.nav-item:not(.has-sub) > a')
+                    };
+                }
+            """)
+            for kind, label in (("submenu", "Submenu element"), ("direct", "Sidebar direct link")):
+                for idx, item in enumerate(items[kind]):
+                    href = item['href']
+                    print(f"[DEBUG] {label} {idx}: text='{item['text']}', href='{href}'")
+                    logger.info(f"{label} {idx}: text='{href}'")
+                    if href and href not in links and (href.startswith(self.base_url) or href.startswith('/')):
                         # Convert relative to absolute if needed
-                        if sub_href.startswith('/'):
-                            sub_href = self.base_url.rstrip('/') + sub_href
-                        links.append(sub_href)
-                except Exception as e:
-                    logger.warning(f"Sidebar submenu link error: {str(e)}")
-            # 3. Collect all direct sidebar links (not expanders)
-            direct_links = await sidebar_container.query_selector_all('li.nav-item:not(.has-sub) > a')
-            for idx, el in enumerate(direct_links):
-                try:
-                    el_text = await el.inner_text() if hasattr(el, 'inner_text') else ''
-                    el_href = await el.get_attribute('href') or await el.get_attribute('data-href') or ''
-                    print(f"[DEBUG] Sidebar direct link {idx}: text='{el_text}', href='{el_href}'")
-                    logger.info(f"Sidebar direct link {idx}: text='{el_href}'")
-                    if el_href and el_href not in links and (el_href.startswith(self.base_url) or el_href.startswith('/')):
-                        if el_href.startswith('/'):
-                            el_href = self.base_url.rstrip('/') + el_href
-                        links.append(el_href)
-                except Exception as e:
-                    logger.warning(f"Sidebar direct link error: {str(e)}")
+                        if href.startswith('/'):
+                            href = self.base_url.rstrip('/') + href
+                        links.append(href)
             if not links:
                 console.print("[yellow]No visible sidebar or submenu links found inside #main-menu-navigation. Printing sidebar HTML for debugging:[/yellow]")
-                sidebar_html = await sidebar_container.inner_html()
-                logger.warning(f"Sidebar discover DOM snapshot (truncated): {sidebar_html[:1000]}")
+                sidebar_html = await sidebar_container.evaluate("(el) => el.innerHTML.slice(0, 1000)")
+                logger.warning(f"Sidebar discover DOM snapshot (truncated): {sidebar_html}")
             else:
                 console.print(f"[blue]Sidebar/submenu crawl list ({len(links)}):[blue]")
                 for l in links:
@@ -503,8 +677,11 @@ class QABot:
             return links
         except Exception as e:
             logger.error(f"Error discovering links: {str(e)}")
-            dom = await self.page.content()
-            logger.warning(f"Sidebar discover error DOM snapshot (truncated): {dom[:1000]}")
+            try:
+                dom = await self._html_snippet()
+            except Exception:
+                dom = ""
+            logger.warning(f"Sidebar discover error DOM snapshot (truncated): {dom}")
             return []
 
     async def check_for_broken_links(self):
@@ -517,37 +694,55 @@ class QABot:
                     return anchors.map(a => a.getAttribute('href'));
                 }
             ''')
+            # Anchor targets are resolved in one evaluate; each http(s) URL is requested once
+            anchor_ids = []
+            http_links = []
+            for link in links:
+                if link and link.startswith('#') and link[1:]:
+                    anchor_ids.append(link[1:])
+                elif link and link.startswith('http'):
+                    http_links.append(link)
+            anchor_ids = list(dict.fromkeys(anchor_ids))
+            http_links = list(dict.fromkeys(http_links))
+            anchor_exists = await self.page.evaluate(
+                "(ids) => ids.map(id => document.getElementById(id) !== null)", anchor_ids
+            ) if anchor_ids else []
+            missing_anchors = {anchor_id for anchor_id, exists in zip(anchor_ids, anchor_exists) if not exists}
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
             ) as progress:
-                task = progress.add_task("Checking links...", total=len(links))
-                for link in links:
-                    if not link or link.startswith('javascript:'):
-                        progress.update(task, advance=1)
-                        continue
-                    if link.startswith('#'):
-                        # Anchor link: check if element with that id exists
-                        anchor_id = link[1:]
-                        if not anchor_id:
-                            self.results.broken_links.append(f"Empty anchor link: {link}")
-                        else:
-                            exists = await self.page.evaluate(f"document.getElementById('{anchor_id}') !== null")
-                            if not exists:
-                                self.results.broken_links.append(f"Anchor link #{anchor_id} missing target element")
-                        progress.update(task, advance=1)
-                        continue
-                    if not link.startswith('http'):
-                        progress.update(task, advance=1)
-                        continue
-                    try:
-                        response = await self.context.request.get(link, timeout=5000)
-                        status = response.status
-                        if status >= 400:
-                            self.results.broken_links.append(f"{link} (Status: {status})")
-                    except Exception:
-                        self.results.broken_links.append(f"{link} (Failed to connect)")
-                    progress.update(task, advance=1)
+                task = progress.add_task("Checking links...", total=len(http_links))
+                sem = asyncio.Semaphore(20)
+
+                async def check_link(link):
+                    async with sem:
+                        try:
+                            # HEAD skips the body. Many servers and CDNs answer HEAD with an error
+                            # (403, 404, 405, ...) or drop it while GET works, so only a GET result
+                            # can mark a link broken
+                            try:
+                                response = await self.context.request.fetch(link, method="HEAD", timeout=5000)
+                                if response.status < 400:
+                                    return None
+                            except Exception:
+                                pass
+                            response = await self.context.request.get(link, timeout=5000)
+                            status = response.status
+                            return f"{link} (Status: {status})" if status >= 400 else None
+                        except Exception:
+                            return f"{link} (Failed to connect)"
+                        finally:
+                            progress.update(task, advance=1)
+
+                http_results = await asyncio.gather(*(check_link(link) for link in http_links))
+            for link in links:
+                if link == '#':
+                    self.results.broken_links.append(f"Empty anchor link: {link}")
+            for anchor_id in anchor_ids:
+                if anchor_id in missing_anchors:
+                    self.results.broken_links.append(f"Anchor link #{anchor_id} missing target element")
+            self.results.broken_links.extend(r for r in http_results if r)
         except Exception as e:
             logger.error(f"Error checking broken links: {str(e)}")
 
@@ -563,37 +758,57 @@ class QABot:
         logger.info(f"Attempting to login to {url}")
         
         try:
-            if url.endswith('/login'):
-                # If the URL already has /login, navigate directly
-                await self.navigate_to(url)
-            else:
-                # Try a few common login paths
-                login_found = False
-                for login_path in ['/login', '/signin', '/account/login', '/auth/login', '/user/login']:
-                    try:
-                        login_url = f"{url.rstrip('/')}{login_path}"
-                        await self.navigate_to(login_url)
-                        login_found = True
-                        break
-                    except Exception:
-                        continue
-                
-                if not login_found:
-                    # If no login page found through direct paths, try the homepage
-                    await self.navigate_to(url)
-            
-            # Attempt to find and login using the homepage form detection
-            login_result = await self.find_and_login_homepage(url, credentials)
-            if login_result:
+            if await self._restore_session(url, credentials):
                 return True
-            
-            # If that fails, try a more general approach
-            return await self.try_login(url, credentials)
+
+            # try_login opens the given URL itself and only then walks the common login paths,
+            # so there is no need to navigate anywhere first
+            login_result = await self.try_login(url, credentials)
+            if login_result:
+                await self._save_session(url, credentials)
+            return login_result
             
         except Exception as e:
             logger.error(f"Login error: {str(e)}")
             return False
 
+    def _session_path(self, url: str, credentials: LoginCredentials) -> Path:
+        """Saved-session file for this site and user"""
+        key = f"{urlparse(url).netloc}|{credentials.username}".encode()
+        return self.SESSION_DIR / f"{hashlib.sha1(key).hexdigest()[:16]}.json"
+
+    async def _save_session(self, url: str, credentials: LoginCredentials):
+        """Store the logged-in context's cookies and localStorage for the next run"""
+        try:
+            self.SESSION_DIR.mkdir(exist_ok=True)
+            await self.context.storage_state(path=str(self._session_path(url, credentials)))
+        except Exception as e:
+            logger.warning(f"Could not save login session: {str(e)}")
+
+    async def _restore_session(self, url: str, credentials: LoginCredentials,
+                               post_login_selector: str = '#main-menu-navigation') -> bool:
+        """Reopen the context with a recent saved session and check it is still logged in"""
+        path = self._session_path(url, credentials)
+        try:
+            if time.time() - path.stat().st_mtime > self.SESSION_MAX_AGE:
+                return False
+        except FileNotFoundError:
+            return False
+        try:
+            await self.context.close()
+            await self._open_context(storage_state=str(path))
+            await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            await self.page.wait_for_selector(post_login_selector, state='visible', timeout=5000)
+            console.print("[green]Reused saved login session[/green]")
+            return True
+        except Exception as e:
+            logger.info(f"Saved login session not usable, logging in again: {str(e)}")
+            path.unlink(missing_ok=True)
+            # Start the normal login from a clean context
+            await self.context.close()
+            await self._open_context()
+            return False
+
     async def test_form_submission(self, form_selector: str, fields: Dict[str, str]):
         """Test form submission by filling out form fields and submitting the form.
         
@@ -606,91 +821,104 @@ class QABot:
         try:
             # Fill in the form
             for selector, value in fields.items():
-                # Replace template variables like {{username}} with actual values
-                if isinstance(value, str) and "{{" in value and "}}" in value:
-                    # Extract variable name
-                    var_name = value.strip("{{").strip("}}")
-                    # Check if it's a credential
-                    if self.credentials and hasattr(self.credentials, var_name):
-                        value = getattr(self.credentials, var_name)
+                # Replace template variables like {{username}} with the matching credential
+                template = _TEMPLATE_VAR_RE.fullmatch(value) if isinstance(value, str) else None
+                if template and self.credentials and hasattr(self.credentials, template.group(1)):
+                    value = getattr(self.credentials, template.group(1))
                 
                 await self.page.fill(selector, value)
                 
-            # Submit the form and wait for navigation or network idle
+            # Submit the form and wait for the next document (not network idle: analytics and
+            # long-polling keep the network busy and would burn the whole timeout)
+            initial_url = self.page.url
+            # Set once a click or Enter press has actually gone through, even if no navigation follows
+            submitted = False
             try:
                 # First try to find a submit button within the form
-                submit_selectors = [
-                    "button[type='submit']", "input[type='submit']", 
-                    "button.btn-outline-primary", "button.login-button", 
-                    ".login-form button", "form button"
-                ]
-                
-                submit_clicked = False
-                
-                for sel in submit_selectors:
+                submit_selectors = [f"{form_selector} {sel}" for sel in _SUBMIT_SELECTORS]
+                try:
+                    # First selector (in priority order) whose first match is visible, found in one round-trip
+                    submit_sel = await self.page.evaluate("""
+                        (sels) => sels.find(s => {
+                            const el = document.querySelector(s);
+                            if (!el) return false;
+                            const r = el.getBoundingClientRect();
+                            return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+                        }) || null
+                    """, submit_selectors)
+                except PlaywrightError:
+                    # querySelector cannot parse Playwright-only selectors (text=, :has-text(), >>);
+                    # check the candidates one by one through Playwright instead
+                    submit_sel = None
+                    for sel in submit_selectors:
+                        try:
+                            submit_el = await self.page.query_selector(sel)
+                            if submit_el and await submit_el.is_visible():
+                                submit_sel = sel
+                                break
+                        except PlaywrightError as lookup_error:
+                            logger.debug(f"Could not look up {sel}: {str(lookup_error)}")
+                if submit_sel:
                     try:
-                        submit_el = await self.page.query_selector(f"{form_selector} {sel}")
-                        if submit_el and await submit_el.is_visible():
-                            console.print(f"[blue]Clicking submit button with selector: {sel}[/blue]")
-                            async with self.page.expect_navigation(wait_until="networkidle", timeout=30000):
-                                await submit_el.click()
-                            submit_clicked = True
-                            break
+                        console.print(f"[blue]Clicking submit button with selector: {submit_sel}[/blue]")
+                        async with self.page.expect_navigation(wait_until="domcontentloaded", timeout=10000):
+                            await self.page.locator(submit_sel).first.click()
+                            submitted = True
                     except Exception as submit_error:
-                        logger.debug(f"Could not click {sel}: {str(submit_error)}")
+                        logger.debug(f"Could not click {submit_sel}: {str(submit_error)}")
                 
                 # If no submit button was found/clicked, try pressing Enter in the last field
-                if not submit_clicked:
+                if not submitted:
                     console.print("[blue]No submit button found, pressing Enter in the last field[/blue]")
-                    last_selector = list(fields.keys())[-1]
-                    async with self.page.expect_navigation(wait_until="networkidle", timeout=30000):
+                    last_selector = next(reversed(fields))
+                    async with self.page.expect_navigation(wait_until="domcontentloaded", timeout=10000):
                         await self.page.press(last_selector, "Enter")
+                        submitted = True
             
             except Exception as nav_error:
                 logger.warning(f"Navigation after form submit didn't complete: {str(nav_error)}")
                 console.print(f"[yellow]Navigation after form submit didn't complete: {str(nav_error)}[/yellow]")
             
-            # Check for success indicators
-            await self.page.wait_for_load_state("networkidle", timeout=5000)
+            if not submitted:
+                raise RuntimeError(f"Form {form_selector} was not submitted: no submit button could be clicked "
+                                   f"and Enter could not be pressed in the last field")
+            
+            # Give the page a moment to finish loading or move away from the form URL
+            try:
+                await self.page.wait_for_function(
+                    "(initialUrl) => document.readyState === 'complete' || location.href !== initialUrl",
+                    arg=initial_url, timeout=3000
+                )
+            except PlaywrightTimeoutError:
+                logger.debug(f"Page still loading after form submit: {self.page.url}")
             
             # If we have a results object, store the outcome
-            if hasattr(self, "results"):
-                if not hasattr(self.results, "passed"):
-                    self.results.passed = []
-                
-                if isinstance(self.results.passed, list):
-                    self.results.passed.append({
-                        "url": self.page.url,
-                        "action": f"Form submission {form_selector}",
-                        "result": "Success"
-                    })
-                else:
-                    print("DEBUG: self.results.passed is not a list!")
+            if self.results is not None:
+                self.results.passed.append({
+                    "url": self.page.url,
+                    "action": f"Form submission {form_selector}",
+                    "result": "Success"
+                })
             
         except Exception as e:
             logger.error(f"Form submission error: {str(e)}")
-            if hasattr(self, "results"):
-                if not hasattr(self.results, "failed"):
-                    self.results.failed = []
-                    
-                if isinstance(self.results.failed, list):
-                    self.results.failed.append({
-                        "url": self.page.url,
-                        "action": f"Form submission {form_selector}",
-                        "result": f"Exception: {str(e)}"
-                    })
-                else:
-                    print("DEBUG: self.results.failed is not a list!")
+            if self.results is not None:
+                self.results.failed.append({
+                    "url": self.page.url,
+                    "action": f"Form submission {form_selector}",
+                    "result": f"Exception: {str(e)}"
+                })
             raise e
 
     async def test_responsive_design(self, url: str = None, config: dict = None):
         """Test responsive design: checks for viewport meta, horizontal scroll, images, fixed elements."""
-        page_key = (url or self.page.url).split('#')[0]
+        page_url = url or self.page.url
+        page_key = self._normalize_url(page_url)
         if page_key in self.responsive_checked_pages:
-            console.print(f"[yellow]Responsive check already performed for {page_key}, skipping duplicate.[/yellow]")
+            console.print(f"[yellow]Responsive check already performed for {page_url.split('#')[0]}, skipping duplicate.[/yellow]")
             return []
         self.responsive_checked_pages.add(page_key)
-        page_name = (url or self.page.url).split('/')[-1]
+        page_name = page_url.split('/')[-1]
         if not page_name:
             page_name = "Home"
         else:
@@ -705,29 +933,19 @@ class QABot:
             {"name": "Desktop", "width": 1920, "height": 1080}
         ]
         original_viewport = self.page.viewport_size
-        if not hasattr(self, 'results') or not hasattr(self.results, 'responsive_issue_summary') or self.results.responsive_issue_summary is None:
+        if self.results.responsive_issue_summary is None:
             self.results.responsive_issue_summary = []
+        has_viewport = None
         for device in devices:
             await self.page.set_viewport_size({"width": device["width"], "height": device["height"]})
-            await self.page.wait_for_timeout(500)
-            has_viewport = await self.page.evaluate("""
-                () => !!document.querySelector('meta[name=viewport]')
-            """)
-            has_horizontal_scroll = await self.page.evaluate("""
-                () => document.documentElement.scrollWidth > document.documentElement.clientWidth + 2
-            """)
-            images_without_maxwidth = await self.page.evaluate("""
-                () => Array.from(document.querySelectorAll('img')).filter(img => {
-                    const style = getComputedStyle(img);
-                    return !(style.maxWidth === '100%' || style.width === '100%');
-                }).map(img => img.src)
-            """)
-            fixed_elements = await self.page.evaluate("""
-                () => Array.from(document.querySelectorAll('*')).filter(el => {
-                    const style = getComputedStyle(el);
-                    return style.position === 'fixed' && parseFloat(style.width) > 100 && parseFloat(style.height) > 40;
-                }).map(el => el.tagName + (el.id ? '#' + el.id : ''))
-            """)
+            checks = await self.page.evaluate(_RESPONSIVE_CHECKS_JS, {
+                "candidates": _FIXED_CANDIDATES_SELECTOR, "checkMeta": has_viewport is None
+            })
+            if has_viewport is None:
+                has_viewport = checks["hasViewport"]
+            has_horizontal_scroll = checks["hasHScroll"]
+            images_without_maxwidth = checks["imgs"]
+            fixed_elements = checks["fixed"]
             if not has_viewport:
                 self.results.responsive_issue_summary.append({
                     "device": device["name"],
@@ -750,7 +968,7 @@ class QABot:
                 self.results.responsive_issue_summary.append({
                     "device": device["name"],
                     "issue_type": "Images Without max-width:100%",
-                    "count": len(images_without_maxwidth),
+                    "count": checks["imgCount"],
                     "fix": "Add CSS: img { max-width: 100%; height: auto; }",
                     "example_selector": images_without_maxwidth[0] if images_without_maxwidth else None,
                     "severity": "Moderate"
@@ -759,7 +977,7 @@ class QABot:
                 self.results.responsive_issue_summary.append({
                     "device": device["name"],
                     "issue_type": "Large Fixed Elements",
-                    "count": len(fixed_elements),
+                    "count": checks["fixedCount"],
                     "fix": "Avoid large fixed-position elements that block content on mobile.",
                     "example_selector": fixed_elements[0] if fixed_elements else None,
                     "severity": "Moderate"
@@ -775,17 +993,10 @@ class QABot:
                     const nav = performance.getEntriesByType('navigation')[0] || {};
                     const paints = performance.getEntriesByType('paint');
                     const fcp = paints.find(e => e.name === 'first-contentful-paint');
+                    // Recorded by _LCP_OBSERVER_JS from the start of the page load
                     const lcpEntry = (window.__lcp || null);
                     let lcp = null;
                     if (lcpEntry && lcpEntry.startTime) lcp = lcpEntry.startTime;
-                    // Listen for LCP if not already captured
-                    if (!window.__lcpListenerAdded) {
-                        window.__lcpListenerAdded = true;
-                        new PerformanceObserver((entryList) => {
-                            const entries = entryList.getEntries();
-                            window.__lcp = entries[entries.length - 1];
-                        }).observe({type: 'largest-contentful-paint', buffered: true});
-                    }
                     return {
                         navigationStart: nav.startTime || performance.timing.navigationStart,
                         domContentLoaded: nav.domContentLoadedEventEnd || performance.timing.domContentLoadedEventEnd,
@@ -798,8 +1009,6 @@ class QABot:
                     };
                 }
             """)
-            if not hasattr(self.results, 'performance_details'):
-                self.results.performance_details = []
             self.results.performance_details.append({
                 'url': self.page.url,
                 'metrics': perf_metrics
@@ -809,34 +1018,20 @@ class QABot:
 
     def update_responsiveness_scores(self):
         """Update responsiveness scores based on unique responsive issue types (per device)."""
-        if not hasattr(self.results, 'responsiveness_scores') or self.results.responsiveness_scores is None:
-            self.results.responsiveness_scores = {}
         devices = ["Mobile", "Tablet", "Desktop"]
-        device_unique_issues = {d: set() for d in devices}
-        if hasattr(self.results, 'responsive_issue_summary') and self.results.responsive_issue_summary:
-            for issue in self.results.responsive_issue_summary:
-                device = issue.get("device", None)
-                if device in device_unique_issues:
-                    key = (issue.get("issue_type", None), issue.get("fix", None))
-                    device_unique_issues[device].add(key)
-        for device in devices:
-            unique_issues = len(device_unique_issues[device])
-            score = 100 - (unique_issues * 5)
-            if score < 0:
-                score = 0
-            self.results.responsiveness_scores[device] = {
-                'score': score,
-                'issues': unique_issues
-            }
+        unique_issues = defaultdict(set)
+        for issue in self.results.responsive_issue_summary or []:
+            unique_issues[issue.get("device")].add((issue.get("issue_type"), issue.get("fix")))
+        self.results.responsiveness_scores = {
+            device: {"score": max(0, 100 - 5 * len(unique_issues[device])), "issues": len(unique_issues[device])}
+            for device in devices
+        }
 
     async def generate_report(self):
         # Always update responsiveness scores right before generating the report
         self.update_responsiveness_scores()
-        from report_generator import MarkdownReportGenerator, HTMLReportGenerator
-        md_generator = MarkdownReportGenerator(self.results)
-        html_generator = HTMLReportGenerator(self.results)
-        md_report = md_generator.generate()
-        html_report = html_generator.generate()
+        from report_generator import generate_all
+        md_report, html_report = generate_all(self.results)
         print(f"[green]Reports generated successfully![/green]")
         print(f"[green]- Markdown report: {md_report}[/green]")
         print(f"[green]- HTML report: {html_report}[/green]")
@@ -854,11 +1049,13 @@ def test(
     password: str = typer.Option(..., help="Login password (required)", hide_input=True),
     urls_file: Optional[str] = typer.Option(None, help="File containing URLs to test (one per line)"),
     headless: bool = typer.Option(None, help="Run in headless mode (--no-headless for visible browser)"),
-    report: bool = typer.Option(True, help="Generate detailed HTML/Markdown report")
+    report: bool = typer.Option(True, help="Generate detailed HTML/Markdown report"),
+    concurrency: int = typer.Option(5, help="Number of pages checked in parallel during the crawl"),
+    fast: bool = typer.Option(False, help="Skip downloading images, media and fonts")
 ):
     """Run a full, professional QA test on a website (curated generic tests, multi-page crawl)"""
     async def run_test():
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Ask for headless mode if not specified
             use_headless = headless
@@ -872,7 +1069,7 @@ def test(
                 transient=True,
             ) as progress:
                 task = progress.add_task("[green]Setting up browser...", total=None)
-                qa_bot = QABot(headless=use_headless)
+                qa_bot = QABot(headless=use_headless, fast_mode=fast)
                 await qa_bot.setup()
                 progress.update(task, description="[green]Preparing test environment...")
                 credentials = LoginCredentials(
@@ -903,26 +1100,45 @@ def test(
                         "step": "Login",
                         "url": qa_bot.page.url,
                         "status": "Success",
-                        "load_time": round(time.time() - start_time, 2)
+                        "load_time": round(time.perf_counter() - start_time, 2)
                     })
                 # 2. SSL Certificate
                 qa_bot.results.ssl_status = await qa_bot.check_ssl(url)
-                # 3. Discover links (always try to crawl public pages)
+                # 3./4. Discover links (always try to crawl public pages) and, for each discovered page, run
+                # navigation, broken links, UI, and responsive checks. A few workers, each with its own page in the
+                # logged-in browser context, take URLs off a queue, so checking the start page overlaps with
+                # discovery on the main page. None tells a worker there is nothing more to come.
                 discovered_urls = [url]
-                links = await qa_bot.discover_links(max_links=20)
-                for link in links:
-                    if link not in discovered_urls:
-                        discovered_urls.append(link)
-                # 4. For each discovered page, run navigation, broken links, UI, and responsive checks
-                ui_checks_run = 0
-                responsive_checks_run = 0
-                for page_url in discovered_urls:
-                    nav_success = await qa_bot.navigate_to(page_url)
-                    await qa_bot.check_for_broken_links()
-                    result1 = await qa_bot.check_ui_elements()
-                    ui_checks_run += 1
-                    result2 = await qa_bot.test_responsive_design(url=None)
-                    responsive_checks_run += 1
+                queue = asyncio.Queue()
+                queue.put_nowait(url)
+
+                async def check_pages():
+                    worker = await qa_bot.new_worker()
+                    try:
+                        while (page_url := await queue.get()) is not None:
+                            try:
+                                await worker.navigate_to(page_url)
+                                await worker.check_for_broken_links()
+                                await worker.check_ui_elements()
+                                await worker.test_responsive_design(url=None)
+                            except Exception as e:
+                                logger.error(f"Error checking {page_url}: {str(e)}")
+                    finally:
+                        await worker.page.close()
+
+                workers = [asyncio.create_task(check_pages()) for _ in range(max(1, concurrency))]
+                try:
+                    links = await qa_bot.discover_links(max_links=20)
+                    for link in links:
+                        if link not in discovered_urls:
+                            discovered_urls.append(link)
+                            queue.put_nowait(link)
+                finally:
+                    for _ in workers:
+                        queue.put_nowait(None)
+                    await asyncio.gather(*workers)
+                ui_checks_run = len(discovered_urls)
+                responsive_checks_run = len(discovered_urls)
                 # 5. Only report 'No UI/responsive issues' if checks were actually run
                 if ui_checks_run == 0:
                     qa_bot.results.ui_issue_summary = None
@@ -970,7 +1186,8 @@ def run_flow(
     password: str = typer.Option(..., help="Login password (required)"),
     headless: bool = typer.Option(None, help="Run in headless mode (--no-headless for visible browser)"),
     skip_login: bool = typer.Option(False, help="Skip login step even if credentials are provided"),
-    report: bool = typer.Option(True, help="Generate detailed HTML/Markdown report")
+    report: bool = typer.Option(True, help="Generate detailed HTML/Markdown report"),
+    fast: bool = typer.Option(False, help="Skip downloading images, media and fonts")
 ):
     """Run a test flow on a website"""
     # Remove any extra quotes that might have been added when calling from the interactive menu
@@ -994,7 +1211,7 @@ def run_flow(
             ) as progress:
                 task = progress.add_task("[green]Setting up browser...", total=None)
                 
-                qa_bot = QABot(headless=use_headless)
+                qa_bot = QABot(headless=use_headless, fast_mode=fast)
                 await qa_bot.setup()
                 
                 progress.update(task, description="[green]Preparing test environment...")
@@ -1027,36 +1244,30 @@ def run_flow(
                 )
                 
                 # Make sure passed/failed steps from flow execution are added to qa_bot.results
-                for step in flow_results.get("passed", []):
-                    if hasattr(qa_bot.results, 'passed') and isinstance(qa_bot.results.passed, list):
-                        qa_bot.results.passed.append(step)
-                
-                for step in flow_results.get("failed", []):
-                    if hasattr(qa_bot.results, 'failed') and isinstance(qa_bot.results.failed, list):
-                        qa_bot.results.failed.append(step)
+                qa_bot.results.passed.extend(flow_results.get("passed", []))
+                qa_bot.results.failed.extend(flow_results.get("failed", []))
                 
                 # Generate reports
                 if report and qa_bot.results:
-                    from report_generator import MarkdownReportGenerator, HTMLReportGenerator
+                    from report_generator import generate_all
                     console.print("[blue]Generating test reports...[/blue]")
-                    md_generator = MarkdownReportGenerator(qa_bot.results)
-                    html_generator = HTMLReportGenerator(qa_bot.results)
-                    md_report = md_generator.generate()
-                    html_report = html_generator.generate()
+                    md_report, html_report = generate_all(qa_bot.results)
                     
                     console.print(f"[green]Reports generated successfully![/green]")
                     console.print(f"[green]- Markdown report: {md_report}[/green]")
                     console.print(f"[green]- HTML report: {html_report}[/green]")
                     console.print(f"[bold blue]To view the report, open the HTML file above in your browser.[/bold blue]")
                     
-                    # Automatically open the HTML report
-                    import sys, os
-                    if sys.platform.startswith('win'):
-                        os.startfile(html_report)
-                    elif sys.platform.startswith('darwin'):
-                        os.system(f'open "{html_report}"')
-                    elif sys.platform.startswith('linux'):
-                        os.system(f'xdg-open "{html_report}"')
+                    # Automatically open the HTML report, without going through a shell or waiting for the viewer
+                    try:
+                        if sys.platform.startswith('win'):
+                            os.startfile(html_report)
+                        elif sys.platform.startswith('darwin'):
+                            subprocess.Popen(['open', html_report])
+                        elif sys.platform.startswith('linux'):
+                            subprocess.Popen(['xdg-open', html_report], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                    except OSError as e:
+                        logger.warning(f"Could not open the HTML report: {str(e)}")
                 
                 # Print flow execution summary
                 console.print("\n[bold green]Flow Execution Summary:[/bold green]")
@@ -1139,9 +1350,14 @@ def list_flows(
         table = Table(title="Available Test Flows")
         table.add_column("Environment", style="cyan")
         table.add_column("Flow Name", style="green")
+        table.add_column("Base URL", style="yellow")
         for env, flow_list in flows.items():
             for flow in flow_list:
-                table.add_row(env, flow)
+                try:
+                    base_url = flow_manager.load_flow_header(flow, env).get("base_url", "")
+                except Exception:
+                    base_url = ""
+                table.add_row(env, flow, base_url)
         console.print(table)
     except Exception as e:
         console.print(f"[bold red]Error listing flows: {str(e)}[bold red]")
@@ -1173,7 +1389,7 @@ def generate_flow(
     environment: str = typer.Option("prod", help="Environment for the flow (prod, uat)"),
     description: str = typer.Option(..., help="Plain English description of the flow")
 ):
-    """Generate a new flow YAML from a plain English description."""
+    """Generate a new flow from a plain English description."""
     flow_name = flow_name.strip('"\'')
     description = description.strip('"\'')
     if environment not in ["prod", "uat"]:
@@ -1183,56 +1399,29 @@ def generate_flow(
     # Simple template system: parse description into steps (for demo, just one step)
     # In production, you could use an LLM or more advanced parser
     steps = []
-    for line in description.split(". "):
+    for line in _SENTENCE_SPLIT_RE.split(description):
         line = line.strip()
         if not line:
             continue
-        # Very basic mapping for demo
-        if "login" in line.lower():
-            steps.append({
-                "name": "Login",
-                "action": "fill_form",
-                "form_selector": "form",
-                "fields": {
-                    "input[name='username']": "{{username}}",
-                    "input[name='password']": "{{password}}"
-                }
-            })
-        elif "navigate" in line.lower():
-            steps.append({
-                "name": "Navigate",
-                "action": "navigate",
-                "url": "/"
-            })
-        elif "check ui" in line.lower():
-            steps.append({
-                "name": "Check UI",
-                "action": "check_ui"
-            })
-        elif "responsive" in line.lower():
-            steps.append({
-                "name": "Test Responsive Design",
-                "action": "test_responsive"
-            })
-        # Add more mappings as needed
+        # Very basic mapping for demo: the first keyword rule that matches picks the step
+        match = _FLOW_KEYWORD_RE.match(line)
+        if match:
+            steps.append(_FLOW_STEP_TEMPLATES[match.lastgroup])
         else:
             steps.append({
                 "name": line,
                 "action": "custom",
                 "description": line
             })
-    flow_yaml = {
+    flow_data = {
         "name": flow_name,
         "description": description,
         "base_url": "https://example.com",
         "steps": steps
     }
-    flow_dir = Path(f"flows/{environment}")
-    flow_dir.mkdir(parents=True, exist_ok=True)
-    flow_path = flow_dir / f"{flow_name}.yaml"
-    with open(flow_path, "w", encoding="utf-8") as f:
-        yaml.dump(flow_yaml, f, sort_keys=False, allow_unicode=True)
-    console.print(f"[green]Generated flow YAML:[/green] {flow_path}")
+    # Saved like every other flow (JSON, replacing any legacy YAML copy) so run-flow picks it up
+    flow_path = FlowManager().save_flow(flow_name, flow_data, environment)
+    console.print(f"[green]Generated flow:[/green] {flow_path}")
 
 
 if __name__ == "__main__":
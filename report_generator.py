@@ -2,30 +2,431 @@
 """
 Report Generator Module for QA Bot
 """
+import io
 import os
-import json
+import re
+import ssl
+import time
+from bisect import bisect_right
+from collections import Counter, defaultdict
 from datetime import datetime
+from html import escape
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Union, Optional
+from typing import Dict, List, Union, Optional, Tuple
+
+# Prefer orjson's C parser for saved results files when it is installed, fall back to the stdlib
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Success-rate thresholds and the status class for each band: below 70, 70 up to 90, 90 and above
+_STATUS_BOUNDS = (70, 90)
+_STATUS_CLASSES = ('error', 'warning', 'success')
+
+# Known non-errors (login bugs): lowercased step name -> text that must all appear in the failure reason
+_SUPPRESSED_FAILS = {
+    "page navigation: create": ("main content area not found",),
+    "fill login form": ("form fill error", "timeout", "page.fill"),
+    "check dashboard/profile is visible after login (post-login check)": ("element should be visible",),
+}
 
 # Suppression function for known non-errors (login bugs)
 def is_suppressed_fail(fail):
-    step = fail.get("step", "").strip().lower() if isinstance(fail, dict) else ""
-    reason = (fail.get("reason") or fail.get("error") or "").lower() if isinstance(fail, dict) else ""
-    return (
-        (step == "page navigation: create" and "main content area not found" in reason)
-        or (step == "fill login form" and "form fill error" in reason and "timeout" in reason and "page.fill" in reason)
-        or (step == "check dashboard/profile is visible after login (post-login check)" and "element should be visible" in reason)
+    if not isinstance(fail, dict):
+        return False
+    needles = _SUPPRESSED_FAILS.get(fail.get("step", "").strip().lower())
+    if not needles:
+        return False
+    reason = (fail.get("reason") or fail.get("error") or "").lower()
+    return all(needle in reason for needle in needles)
+
+# Failure reasons that link to the failing URL (nav) or quote it (http); tried in that order, case-insensitively
+_FAIL_CLASSIFY = re.compile(
+    r"(?:.*?(?P<nav>navigation failed|failed to navigate))"
+    r"|(?:.*?(?P<http>http status|405|method not allowed))",
+    re.IGNORECASE | re.DOTALL,
+)
+_NAV_FAILED_RE = re.compile(r"navigation failed", re.IGNORECASE)
+
+# (issue_type, count, fix) of a UI or responsive issue summary entry, for the recommendation lines
+_issue_line_fields = itemgetter('issue_type', 'count', 'fix')
+
+# Absolute report directories already created in this process
+_ensured_report_dirs: set = set()
+
+
+def _ensure_reports_dir(path: str = "reports") -> Path:
+    """The reports directory, created at most once per process"""
+    reports_dir = Path(path)
+    key = os.path.abspath(reports_dir)
+    if key not in _ensured_report_dirs:
+        reports_dir.mkdir(exist_ok=True)
+        _ensured_report_dirs.add(key)
+    return reports_dir
+
+
+def _report_stem(results) -> str:
+    """File name (without extension) shared by the Markdown and HTML reports of one results object"""
+    stem = getattr(results, '_report_stem', None)
+    if stem is None:
+        website = results.website.replace("://", "_").replace("/", "_").rstrip("_")
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        stem = results._report_stem = f"{website}_{timestamp}"
+    return stem
+
+
+def _responsive_issues_key(results):
+    """Identity and length of results.responsive_issue_summary; it only ever grows, so this changes when it does"""
+    issues = getattr(results, 'responsive_issue_summary', None)
+    return (id(issues), len(issues) if issues else 0)
+
+
+def _summarize_responsive(results):
+    """One pass over results.responsive_issue_summary, cached on results until the list grows.
+
+    Returns (unique issues per device, issues grouped by (issue_type, fix) with total count, pages and examples).
+    """
+    cache_key = _responsive_issues_key(results)
+    cached = getattr(results, '_responsive_summary', None)
+    if cached and cached[0] == cache_key:
+        return cached[1], cached[2]
+    device_issues = set()
+    groups = {}
+    for issue in getattr(results, 'responsive_issue_summary', []) or []:
+        device = issue.get('device', None)
+        if not device:
+            print(f"Warning: Missing device info in responsive issue: {issue}")
+        issue_type, fix = issue['issue_type'], issue.get('fix', '')
+        device_issues.add((device, issue_type, fix))
+        group = groups.get((issue_type, fix))
+        if group is None:
+            group = groups[(issue_type, fix)] = {
+                'issue_type': issue_type,
+                'fix': fix,
+                'severity': issue.get('severity', ''),
+                'count': 0,
+                'pages': {},  # dicts as insertion-ordered sets
+                'examples': {}
+            }
+        group['count'] += issue.get('count', 1)
+        selector = issue.get('example_selector')
+        if selector:
+            group['examples'][selector] = None
+        if hasattr(results, 'website'):
+            group['pages'][results.website] = None
+    device_counts = Counter(device for device, _, _ in device_issues)
+    results._responsive_summary = (cache_key, device_counts, groups)
+    return device_counts, groups
+
+
+def compute_responsiveness_scores(results) -> None:
+    """Set results.responsiveness_scores: 100 minus 5 per unique responsive issue, per device"""
+    device_counts, _ = _summarize_responsive(results)
+    results.responsiveness_scores = {
+        device: {'score': max(0, 100 - device_counts[device] * 5), 'issues': device_counts[device]}
+        for device in ("Mobile", "Tablet", "Desktop")
+    }
+
+
+def group_responsive_issues(results) -> Dict:
+    """Responsive issues grouped by (issue_type, fix) with total count, pages and examples"""
+    return _summarize_responsive(results)[1]
+
+
+def _expiry_badge_class(expiry) -> str:
+    """'success' if a certificate notAfter date (e.g. 'Jun  1 12:00:00 2030 GMT') is still in the future"""
+    try:
+        return 'success' if ssl.cert_time_to_seconds(str(expiry)) > time.time() else 'error'
+    except (ValueError, TypeError):
+        return 'error'
+
+
+def _performance_row(entry) -> str:
+    """Markdown table row for one performance_details entry (timings in whole milliseconds)"""
+    m = entry.get('metrics', {})
+    return (f"| {entry.get('url', '-')} | {int(m.get('domContentLoaded', 0))} | {int(m.get('loadEvent', 0))} "
+            f"| {int(m.get('firstContentfulPaint', 0) or 0)} | {int(m.get('largestContentfulPaint', 0) or 0)} "
+            f"| {int(m.get('responseStart', 0) or 0)} | {int(m.get('responseEnd', 0) or 0)} |\n")
+
+
+# Interactive issues that only get a warning row: the element responded but nothing visibly changed
+_NO_VISIBLE_CHANGE_RE = re.compile(r"no visible change", re.IGNORECASE)
+
+
+def _interactive_issue_row(issue) -> str:
+    """HTML table row for one interactive element issue"""
+    issue_type = issue.get('issue', 'Unknown issue')
+    issue_class = 'warning' if _NO_VISIBLE_CHANGE_RE.search(issue_type) else 'error'
+    return f"""
+                            <tr class=\"{issue_class}\">
+                                <td>{escape(str(issue.get('element', 'Unknown')))}</td>
+                                <td>{escape(str(issue.get('type', 'Unknown')))}</td>
+                                <td>{escape(issue_type)}</td>
+                                <td>{escape(str(issue.get('load_time', 'N/A')))}</td>
+                            </tr>
+                        """
+
+
+# HTML list item for a failed step, by _FAIL_CLASSIFY group: link the URL, quote it, or leave it out
+_FAILED_TEST_ITEMS = {
+    'nav': '<li style="color:#d93025;"><b>{step}</b>: {reason} <a href="{url}" target="_blank">🔗</a></li>',
+    'http': '<li style="color:#d93025;"><b>{step}</b>: {reason} at <code>{url}</code></li>',
+    None: '<li style="color:#d93025;"><b>{step}</b>: {reason}</li>',
+}
+
+
+def _failed_test_item(test) -> str:
+    """HTML list item for one failed step; empty for entries with neither a step name nor a reason"""
+    reason = test.get("reason") or test.get("error") or "[No error message provided]"
+    step = test.get("step") or "[Step name missing]"
+    if step == '[Step name missing]' and reason == '[No error message provided]':
+        return ""
+    match = _FAIL_CLASSIFY.match(reason)
+    return _FAILED_TEST_ITEMS[match.lastgroup if match else None].format(
+        step=escape(str(step)), reason=escape(reason), url=escape(test.get("url", "N/A")))
+
+
+def _write_report(report_file: Path, text: Union[str, List[str]]) -> None:
+    """
+    Write a finished report to a temp file, then rename it into place
+
+    A list of fragments is streamed through the file buffer as-is, so the whole document is never
+    joined (or encoded) into one more copy in memory.
+    """
+    tmp_file = report_file.with_suffix(report_file.suffix + ".tmp")
+    with open(tmp_file, "w", encoding="utf-8", newline="") as f:
+        if isinstance(text, str):
+            f.write(text)
+        else:
+            f.writelines(text)
+    os.replace(tmp_file, report_file)
+
+
+# Static stylesheet for the HTML report, kept out of the per-report f-string
+_HTML_STYLE = """<style>
+    body {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Arial, sans-serif;
+        line-height: 1.6;
+        color: #333;
+        margin: 0;
+        background: #f0f2f5;
+    }
+    .container {
+        max-width: 1200px;
+        margin: 0 auto;
+        padding: 20px;
+    }
+    .card {
+        background: white;
+        border-radius: 8px;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.12);
+        margin-bottom: 20px;
+        padding: 20px;
+    }
+    .header {
+        text-align: center;
+        margin-bottom: 30px;
+    }
+    h1 {
+        color: #1a73e8;
+        margin: 0;
+        padding: 20px 0;
+    }
+    h2 {
+        color: #1a73e8;
+        border-bottom: 2px solid #1a73e8;
+        padding-bottom: 10px;
+        margin-top: 0;
+    }
+    .stats {
+        display: flex;
+        justify-content: center;
+        flex-wrap: wrap;
+        gap: 20px;
+        margin: 20px 0;
+    }
+    .stat-card {
+        background: white;
+        border-radius: 8px;
+        padding: 20px;
+        min-width: 200px;
+        text-align: center;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.12);
+    }
+    .stat-number {
+        font-size: 36px;
+        font-weight: bold;
+        margin: 10px 0;
+    }
+    .success { color: #0d904f; }
+    .warning { color: #f29900; }
+    .error { color: #d93025; }
+    .stat-label {
+        color: #5f6368;
+        font-size: 14px;
+        text-transform: uppercase;
+    }
+    table {
+        width: 100%;
+        border-collapse: collapse;
+        margin: 20px 0;
+        background: white;
+    }
+    th, td {
+        text-align: left;
+        padding: 12px;
+        border: 1px solid #e0e0e0;
+    }
+    th {
+        background: #f8f9fa;
+        font-weight: 600;
+    }
+    tr:hover {
+        background: #f8f9fa;
+    }
+    .issue-card {
+        border-left: 4px solid #d93025;
+        margin: 10px 0;
+        padding: 15px;
+    }
+    .issue-card.critical { border-color: #d93025; }
+    .issue-card.moderate { border-color: #f29900; }
+    .issue-card.minor { border-color: #1a73e8; }
+    .badge {
+        display: inline-block;
+        padding: 4px 8px;
+        border-radius: 4px;
+        font-size: 12px;
+        font-weight: 500;
+    }
+    .badge.success { background: #e6f4ea; color: #0d904f; }
+    .badge.warning { background: #fef7e0; color: #f29900; }
+    .badge.error { background: #fce8e6; color: #d93025; }
+</style>
+"""
+
+# Interactive element stat cards; fill with format_map over a defaultdict(int) so missing counts render 0
+_TPL_INTERACTIVE_STATS = """
+                    <div class="stats">
+                        <div class="stat-card">
+                            <div class="stat-label">Total Tested</div>
+                            <div class="stat-number">{total_tested}</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-label">Successful</div>
+                            <div class="stat-number success">{successful}</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-label">Content Changed</div>
+                            <div class="stat-number success">{content_changed}</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-label">URL Changed</div>
+                            <div class="stat-number success">{url_changed}</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-label">Failed</div>
+                            <div class="stat-number error">{failed}</div>
+                        </div>
+                    </div>
+                """
+
+# Fixed recommendation blocks of the HTML report
+_HTML_SLOW_PAGE_ADVICE = (
+    "</ul></li>"
+    "<li>Suggestions:<ul>"
+    "<li>Optimize images (compress, use WebP)</li>"
+    "<li>Minimize and defer JavaScript/CSS</li>"
+    "<li>Use lazy loading for images</li>"
+    "<li>Audit with Chrome DevTools or Lighthouse</li>"
+    "</ul></li>"
+    "</ul>"
+)
+_HTML_JS_ADVICE = (
+    "<h3>JavaScript Issues</h3>"
+    "<ul>"
+    "<li>JavaScript errors were detected.</li>"
+    "<li>Use browser dev tools to debug errors.</li>"
+    "<li>Check for deprecated APIs or syntax.</li>"
+    "<li>Review recent code changes.</li>"
+    "</ul>"
+)
+_HTML_BROKEN_LINKS_ADVICE = (
+    "<h3>Broken Links</h3>"
+    "<ul>"
+    "<li>Broken links were found.</li>"
+    "<li>Fix or remove broken links.</li>"
+    "<li>Use a site-wide link checker.</li>"
+    "</ul>"
+)
+_HTML_SECURITY_ADVICE = (
+    "<h3>Security Issues</h3>"
+    "<ul>"
+    "<li>SSL certificate is not valid.</li>"
+    "<li>Renew certificate and ensure HTTPS everywhere.</li>"
+    "</ul>"
+)
+_HTML_INTERACTION_ADVICE = (
+    "<h3>Interaction Reliability</h3>"
+    "<ul>"
+    "<li>Review elements marked as 'no visible change' for potential improvements in interaction logic.</li>"
+    "<li>Ensure elements are fully loaded and visible before interaction.</li>"
+    "<li>Consider adding more specific result selectors for content change detection.</li>"
+    "</ul>"
+)
+_HTML_MAINTENANCE = (
+    "<h3>Maintenance</h3>"
+    "<ol>"
+    "<li>📈 Monitor performance metrics</li>"
+    "<li>🔍 Regular testing of critical paths</li>"
+    "<li>🔒 Keep security measures up to date</li>"
+    "</ol>"
+)
+
+# Reports for runs that recorded nothing: no tests, issues, warnings or SSL data
+_EMPTY_MD = """## 📝 Test Details
+
+No findings for {website} ({timestamp}): no tests ran and no issues were recorded.
+Success rate: {success_rate:.1f}%
+"""
+
+_EMPTY_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>QA Test Report: {website}</title>
+</head>
+<body style="font-family: sans-serif; margin: 20px;">
+    <h1>QA Test Report</h1>
+    <p>{website}</p>
+    <p>Generated: {timestamp}</p>
+    <p>No findings: no tests ran and no issues were recorded. Success rate: {success_rate:.1f}%</p>
+</body>
+</html>
+"""
+
+
+def _has_findings(results, filtered_passed, filtered_failed) -> bool:
+    """Whether the results hold anything a full report would show beyond the empty defaults"""
+    return bool(
+        filtered_passed or filtered_failed
+        or results.broken_links or results.js_errors
+        or results.slow_pages or results.performance_issues
+        or getattr(results, 'performance_details', None)
+        or results.responsive_issue_summary or results.ui_issue_summary
+        or results.ssl_status or getattr(results, 'warnings', None)
     )
 
+
 class MarkdownReportGenerator:
     """Generate Markdown reports from test results"""
     
     def __init__(self, results):
         """Initialize with test results"""
         self.results = results
-        self.reports_dir = Path("reports")
-        self.reports_dir.mkdir(exist_ok=True)
+        self.reports_dir = _ensure_reports_dir()
     
     def generate(self) -> str:
         """
@@ -36,48 +437,19 @@ class MarkdownReportGenerator:
         """
         warnings = []  # Ensure warnings is always defined
         # --- Centralized filtering and scoring logic ---
-        def is_known_nonerror(fail):
-            step = fail.get("step", "").strip().lower() if isinstance(fail, dict) else ""
-            reason = (fail.get("reason") or fail.get("error") or "").lower() if isinstance(fail, dict) else ""
-            return (
-                (step == "page navigation: create" and "main content area not found" in reason)
-                or (step == "fill login form" and "form fill error" in reason and "timeout" in reason and "page.fill" in reason)
-                or (step == "check dashboard/profile is visible after login (post-login check)" and "element should be visible" in reason)
-            )
-        def filtered_fails(fails):
-            return [fail for fail in fails if not is_suppressed_fail(fail) and not is_known_nonerror(fail)]
-        filtered_failed = filtered_fails(self.results.failed)
+        filtered_failed = [fail for fail in self.results.failed if not is_suppressed_fail(fail)]
         filtered_passed = self.results.passed
         total_tests = len(filtered_passed) + len(filtered_failed)
         success_rate = (len(filtered_passed) / total_tests * 100) if total_tests > 0 else 0
         # Responsiveness Score: recalculate from summary for each device
-        devices = ["Mobile", "Tablet", "Desktop"]
-        summary = {}
-        for issue in getattr(self.results, 'responsive_issue_summary', []) or []:
-            device = issue.get('device', None)
-            if not device:
-                print(f"Warning: Missing device info in responsive issue: {issue}")
-            key = (device, issue['issue_type'], issue.get('fix', ''))
-            if key not in summary:
-                summary[key] = True
-        device_issue_counts = {d: 0 for d in devices}
-        for (device, issue_type, fix) in summary.keys():
-            if device in device_issue_counts:
-                device_issue_counts[device] += 1
-        self.results.responsiveness_scores = {}
-        for device in devices:
-            unique_issues = device_issue_counts[device]
-            score = 100 - (unique_issues * 5)
-            if score < 0:
-                score = 0
-            self.results.responsiveness_scores[device] = {
-                'score': score,
-                'issues': unique_issues
-            }
-        website = self.results.website.replace("://", "_").replace("/", "_").rstrip("_")
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        report_file = self.reports_dir / f"{website}_{timestamp}.md"
-        with open(report_file, "w", encoding="utf-8") as f:
+        compute_responsiveness_scores(self.results)
+        report_file = self.reports_dir / f"{_report_stem(self.results)}.md"
+        if not _has_findings(self.results, filtered_passed, filtered_failed):
+            _write_report(report_file, _EMPTY_MD.format(
+                website=self.results.website, timestamp=self.results.timestamp, success_rate=success_rate))
+            return str(report_file)
+        # Build the report in memory and write the file once at the end
+        with io.StringIO() as f:
             # SSL status
             if self.results.ssl_status:
                 warnings.append({
@@ -87,12 +459,12 @@ class MarkdownReportGenerator:
             # Critical Issues
             has_critical_issues = False
             if hasattr(self.results, 'ui_issue_summary') and self.results.ui_issue_summary:
-                critical_issues = [i for i in self.results.ui_issue_summary if i.get('severity') == 'Critical']
-                if critical_issues:
+                critical_count = sum(1 for i in self.results.ui_issue_summary if i.get('severity') == 'Critical')
+                if critical_count:
                     has_critical_issues = True
                     warnings.append({
                         "step": "Critical Issues",
-                        "reason": f"{len(critical_issues)} critical issues found"
+                        "reason": f"{critical_count} critical issues found"
                     })
             # Warnings Section
             if warnings:
@@ -125,16 +497,7 @@ class MarkdownReportGenerator:
                 f.write('## 🚦 Performance Details\n\n')
                 f.write('| URL | DOMContentLoaded (ms) | Load Event (ms) | FCP (ms) | LCP (ms) | Response Start (ms) | Response End (ms) |\n')
                 f.write('|-----|----------------------|-----------------|----------|----------|---------------------|-------------------|\n')
-                for entry in self.results.performance_details:
-                    url = entry.get('url', '-')
-                    m = entry.get('metrics', {})
-                    dcl = int(m.get('domContentLoaded', 0))
-                    load = int(m.get('loadEvent', 0))
-                    fcp = int(m.get('firstContentfulPaint', 0) or 0)
-                    lcp = int(m.get('largestContentfulPaint', 0) or 0)
-                    resp_start = int(m.get('responseStart', 0) or 0)
-                    resp_end = int(m.get('responseEnd', 0) or 0)
-                    f.write(f'| {url} | {dcl} | {load} | {fcp} | {lcp} | {resp_start} | {resp_end} |\n')
+                f.write(''.join(_performance_row(entry) for entry in self.results.performance_details))
                 f.write('\n')
             # Broken Links
             if self.results.broken_links:
@@ -153,13 +516,8 @@ class MarkdownReportGenerator:
                     "reason": f"{len(self.results.js_errors)} JavaScript errors"
                 })
                 f.write('## 🛠️ JavaScript Issues\n\n')
-                error_types = {}
-                for error in self.results.js_errors:
-                    error_msg = error["message"]
-                    if error_msg not in error_types:
-                        error_types[error_msg] = 1
-                    else:
-                        error_types[error_msg] += 1
+                # Listed in first-seen order (Counter keeps insertion order)
+                error_types = Counter(error["message"] for error in self.results.js_errors)
                 for msg, count in error_types.items():
                     f.write(f'- ⚠️ {msg} (x{count})\n')
                 f.write('\n')
@@ -182,21 +540,25 @@ class MarkdownReportGenerator:
                     step = fail.get("step", "Not Applicable")
                     reason = fail.get("reason") or fail.get("error") or ""
                     url = fail.get("url", "")
-                    if 'navigation failed' in reason.lower() and url:
+                    if url and _NAV_FAILED_RE.search(reason):
                         nav_failed_urls.add(url)
                     if step == '[Step name missing]' and reason == '[No error message provided]':
                         continue
-                    if 'navigation failed' in reason.lower() or 'failed to navigate' in reason.lower():
+                    match = _FAIL_CLASSIFY.match(reason)
+                    kind = match.lastgroup if match else None
+                    if kind == 'nav':
                         f.write(f'- **{step}**: {reason} [🔗]({url})\n')
-                    elif 'http status' in reason.lower() or '405' in reason or 'method not allowed' in reason.lower():
+                    elif kind == 'http':
                         f.write(f'- **{step}**: {reason} at `{url}`\n')
                     else:
                         f.write(f'- **{step}**: {reason}\n')
                 # Add navigation failed URLs to broken_links if not already present
                 if hasattr(self.results, 'broken_links') and isinstance(self.results.broken_links, list):
+                    known_links = set(self.results.broken_links)
                     for url in nav_failed_urls:
-                        if url and url not in self.results.broken_links:
+                        if url and url not in known_links:
                             self.results.broken_links.append(url)
+                            known_links.add(url)
                 f.write('\n')
             # Interactive Element Results (DISABLED)
             # f.write('<!-- Interactive element results are currently disabled. -->\n')
@@ -208,29 +570,11 @@ class MarkdownReportGenerator:
                 f.write('## 📱 Responsiveness Score\n\n')
                 f.write('| Device   | Score (%) | Issues Found |\n')
                 f.write('|----------|-----------|--------------|\n')
-                for device, data in self.results.responsiveness_scores.items():
-                    score = data.get('score', 0)
-                    issues = data.get('issues', 0)
-                    f.write(f'| {device} | {score} | {issues} |\n')
+                f.write(''.join(f'| {device} | {data.get("score", 0)} | {data.get("issues", 0)} |\n'
+                                for device, data in self.results.responsiveness_scores.items()))
                 f.write('\n')
             # Responsive Issue Summary Section (grouped)
-            summary = {}
-            for issue in getattr(self.results, 'responsive_issue_summary', []) or []:
-                key = (issue['issue_type'], issue.get('fix', ''))
-                if key not in summary:
-                    summary[key] = {
-                        'issue_type': issue['issue_type'],
-                        'fix': issue.get('fix', ''),
-                        'severity': issue.get('severity', ''),
-                        'count': 0,
-                        'pages': set(),
-                        'examples': set()
-                    }
-                summary[key]['count'] += issue.get('count', 1)
-                if 'example_selector' in issue and issue['example_selector']:
-                    summary[key]['examples'].add(issue['example_selector'])
-                if hasattr(self.results, 'website'):
-                    summary[key]['pages'].add(self.results.website)
+            summary = group_responsive_issues(self.results)
             if summary:
                 f.write('## 📱 Responsive Issue Summary\n\n')
                 for key, val in summary.items():
@@ -251,6 +595,7 @@ class MarkdownReportGenerator:
                 f.write('- Reduce third-party scripts\n')
                 f.write('- Enable caching and use a CDN\n')
                 f.write('- Audit with Chrome DevTools or Lighthouse for specific bottlenecks\n')
+            _write_report(report_file, f.getvalue())
         return str(report_file)
     
     def _get_status_color(self, rate: float) -> str:
@@ -295,8 +640,8 @@ class MarkdownReportGenerator:
         # UI/Accessibility Issues
         if hasattr(self.results, 'ui_issue_summary') and self.results.ui_issue_summary:
             f.write('### UI/Accessibility Issues\n')
-            for issue in self.results.ui_issue_summary:
-                f.write(f'- {issue["issue_type"]}: {issue["count"]} occurrences. Fix: {issue["fix"]}\n')
+            for issue_type, count, fix in map(_issue_line_fields, self.results.ui_issue_summary):
+                f.write(f'- {issue_type}: {count} occurrences. Fix: {fix}\n')
             f.write('  - Use axe-core or Lighthouse for accessibility testing.\n')
             wrote_any = True
         # SSL/Security
@@ -310,8 +655,8 @@ class MarkdownReportGenerator:
         # Responsive Issues
         if hasattr(self.results, 'responsive_issue_summary') and self.results.responsive_issue_summary:
             f.write('### Responsive Design Issues\n\n')
-            for issue in self.results.responsive_issue_summary:
-                f.write(f'- {issue["issue_type"]}: {issue["count"]} occurrences. Fix: {issue["fix"]}\n')
+            for issue_type, count, fix in map(_issue_line_fields, self.results.responsive_issue_summary):
+                f.write(f'- {issue_type}: {count} occurrences. Fix: {fix}\n')
             f.write('  - Test on multiple devices and viewports.\n')
             wrote_any = True
         # If nothing specific, show maintenance
@@ -328,8 +673,7 @@ class HTMLReportGenerator:
     def __init__(self, results):
         """Initialize with test results"""
         self.results = results
-        self.reports_dir = Path("reports")
-        self.reports_dir.mkdir(exist_ok=True)
+        self.reports_dir = _ensure_reports_dir()
     
     def generate(self) -> str:
         """
@@ -339,162 +683,42 @@ class HTMLReportGenerator:
             Path to the generated report file
         """
         # --- Centralized filtering and scoring logic ---
-        def is_known_nonerror(fail):
-            step = fail.get("step", "").strip().lower() if isinstance(fail, dict) else ""
-            reason = (fail.get("reason") or fail.get("error") or "").lower() if isinstance(fail, dict) else ""
-            return (
-                (step == "page navigation: create" and "main content area not found" in reason)
-                or (step == "fill login form" and "form fill error" in reason and "timeout" in reason and "page.fill" in reason)
-                or (step == "check dashboard/profile is visible after login (post-login check)" and "element should be visible" in reason)
-            )
-        def filtered_fails(fails):
-            return [fail for fail in fails if not is_suppressed_fail(fail) and not is_known_nonerror(fail)]
-        filtered_failed = filtered_fails(self.results.failed)
+        filtered_failed = [fail for fail in self.results.failed if not is_suppressed_fail(fail)]
         filtered_passed = self.results.passed
         total_tests = len(filtered_passed) + len(filtered_failed)
         success_rate = (len(filtered_passed) / total_tests * 100) if total_tests > 0 else 0
         # Responsiveness Score: recalculate from summary for each device
-        devices = ["Mobile", "Tablet", "Desktop"]
-        summary = {}
-        for issue in getattr(self.results, 'responsive_issue_summary', []) or []:
-            device = issue.get('device', None)
-            if not device:
-                print(f"Warning: Missing device info in responsive issue: {issue}")
-            key = (device, issue['issue_type'], issue.get('fix', ''))
-            if key not in summary:
-                summary[key] = True
-        device_issue_counts = {d: 0 for d in devices}
-        for (device, issue_type, fix) in summary.keys():
-            if device in device_issue_counts:
-                device_issue_counts[device] += 1
-        self.results.responsiveness_scores = {}
-        for device in devices:
-            unique_issues = device_issue_counts[device]
-            score = 100 - (unique_issues * 5)
-            if score < 0:
-                score = 0
-            self.results.responsiveness_scores[device] = {
-                'score': score,
-                'issues': unique_issues
-            }
-        website = self.results.website.replace("://", "_").replace("/", "_").rstrip("_")
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        report_file = self.reports_dir / f"{website}_{timestamp}.html"
+        compute_responsiveness_scores(self.results)
+        report_file = self.reports_dir / f"{_report_stem(self.results)}.html"
+        # Snapshot the result fields read by several sections (broken_links is not: it grows below)
+        slow_pages = getattr(self.results, 'slow_pages', None) or []
+        js_errors = getattr(self.results, 'js_errors', None) or []
+        warnings = getattr(self.results, 'warnings', None) or []
+        ui_issues = getattr(self.results, 'ui_issue_summary', None) or []
+        responsive_issues = getattr(self.results, 'responsive_issue_summary', None) or []
+        ssl_info = getattr(self.results, 'ssl_status', None) or {}
+        if not _has_findings(self.results, filtered_passed, filtered_failed):
+            _write_report(report_file, _EMPTY_HTML.format(
+                website=escape(self.results.website), timestamp=self.results.timestamp, success_rate=success_rate))
+            return str(report_file)
         
         try:
-            html = f"""
+            # Collect the document in pieces and stream them to the file, instead of growing one string with +=
+            parts = []
+            parts.append(f"""
             <!DOCTYPE html>
             <html>
             <head>
                 <meta charset="utf-8">
                 <meta name="viewport" content="width=device-width, initial-scale=1">
-                <title>QA Test Report: {self.results.website}</title>
-                <style>
-                    body {{ 
-                        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Arial, sans-serif;
-                        line-height: 1.6;
-                        color: #333;
-                        margin: 0;
-                        background: #f0f2f5;
-                    }}
-                    .container {{
-                        max-width: 1200px;
-                        margin: 0 auto;
-                        padding: 20px;
-                    }}
-                    .card {{
-                        background: white;
-                        border-radius: 8px;
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.12);
-                        margin-bottom: 20px;
-                        padding: 20px;
-                    }}
-                    .header {{
-                        text-align: center;
-                        margin-bottom: 30px;
-                    }}
-                    h1 {{
-                        color: #1a73e8;
-                        margin: 0;
-                        padding: 20px 0;
-                    }}
-                    h2 {{
-                        color: #1a73e8;
-                        border-bottom: 2px solid #1a73e8;
-                        padding-bottom: 10px;
-                        margin-top: 0;
-                    }}
-                    .stats {{
-                        display: flex;
-                        justify-content: center;
-                        flex-wrap: wrap;
-                        gap: 20px;
-                        margin: 20px 0;
-                    }}
-                    .stat-card {{
-                        background: white;
-                        border-radius: 8px;
-                        padding: 20px;
-                        min-width: 200px;
-                        text-align: center;
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.12);
-                    }}
-                    .stat-number {{
-                        font-size: 36px;
-                        font-weight: bold;
-                        margin: 10px 0;
-                    }}
-                    .success {{ color: #0d904f; }}
-                    .warning {{ color: #f29900; }}
-                    .error {{ color: #d93025; }}
-                    .stat-label {{
-                        color: #5f6368;
-                        font-size: 14px;
-                        text-transform: uppercase;
-                    }}
-                    table {{
-                        width: 100%;
-                        border-collapse: collapse;
-                        margin: 20px 0;
-                        background: white;
-                    }}
-                    th, td {{
-                        text-align: left;
-                        padding: 12px;
-                        border: 1px solid #e0e0e0;
-                    }}
-                    th {{
-                        background: #f8f9fa;
-                        font-weight: 600;
-                    }}
-                    tr:hover {{
-                        background: #f8f9fa;
-                    }}
-                    .issue-card {{
-                        border-left: 4px solid #d93025;
-                        margin: 10px 0;
-                        padding: 15px;
-                    }}
-                    .issue-card.critical {{ border-color: #d93025; }}
-                    .issue-card.moderate {{ border-color: #f29900; }}
-                    .issue-card.minor {{ border-color: #1a73e8; }}
-                    .badge {{
-                        display: inline-block;
-                        padding: 4px 8px;
-                        border-radius: 4px;
-                        font-size: 12px;
-                        font-weight: 500;
-                    }}
-                    .badge.success {{ background: #e6f4ea; color: #0d904f; }}
-                    .badge.warning {{ background: #fef7e0; color: #f29900; }}
-                    .badge.error {{ background: #fce8e6; color: #d93025; }}
-                </style>
+                <title>QA Test Report: {escape(self.results.website)}</title>
+                {_HTML_STYLE}
             </head>
             <body>
                 <div class="container">
                     <div class="header card">
                         <h1>QA Test Report</h1>
-                        <p>{self.results.website}</p>
+                        <p>{escape(self.results.website)}</p>
                         <p>Generated: {self.results.timestamp}</p>
                     </div>
                     <div class="stats">
@@ -515,10 +739,10 @@ class HTMLReportGenerator:
                             <div class="stat-number error">{len(filtered_failed)}</div>
                         </div>
                     </div>
-            """
+            """)
             # SSL Status
-            if self.results.ssl_status:
-                html += """
+            if ssl_info:
+                parts.append("""
                     <div class="card">
                         <h2>SSL Security</h2>
                         <table>
@@ -526,35 +750,26 @@ class HTMLReportGenerator:
                                 <th>Property</th>
                                 <th>Value</th>
                             </tr>
-                """
-                for key, value in self.results.ssl_status.items():
-                    # Improved badge coloring
-                    if key.lower() == 'status':
-                        status_class = "success" if str(value).lower() == 'valid' else "error"
-                    elif key.lower() == 'expiry':
-                        try:
-                            expiry_date = datetime.strptime(str(value), "%b %d %H:%M:%S %Y %Z") if value != 'unknown' else None
-                            now = datetime.utcnow()
-                            if expiry_date and expiry_date > now:
-                                status_class = 'success'
-                            else:
-                                status_class = 'error'
-                        except Exception:
-                            status_class = 'error'
-                    else:
-                        status_class = 'warning'
-                    html += f"""
+                """)
+                # Improved badge coloring: status and expiry are judged once, every other property is a warning
+                badge_classes = {
+                    'status': "success" if str(ssl_info.get('status', '')).lower() == 'valid' else "error",
+                    'expiry': _expiry_badge_class(ssl_info.get('expiry')),
+                }
+                for key, value in ssl_info.items():
+                    status_class = badge_classes.get(key.lower(), 'warning')
+                    parts.append(f"""
                             <tr>
                                 <td>{key.capitalize()}</td>
-                                <td><span class="badge {status_class}">{value}</span></td>
+                                <td><span class="badge {status_class}">{escape(str(value))}</span></td>
                             </tr>
-                    """
-                html += """
+                    """)
+                parts.append("""
                         </table>
                     </div>
-                """
+                """)
             # Responsiveness Score Section (HTML, always show)
-            html += """
+            parts.append("""
                 <div class=\"card\">
                     <h2>Responsiveness Score</h2>
                     <table>
@@ -563,7 +778,7 @@ class HTMLReportGenerator:
                             <th>Score (%)</th>
                             <th>Issues Found</th>
                         </tr>
-            """
+            """)
             # Devices to always show
             devices = ["Mobile", "Tablet", "Desktop"]
             scores = getattr(self.results, 'responsiveness_scores', {}) or {}
@@ -571,113 +786,75 @@ class HTMLReportGenerator:
                 data = scores.get(device, {"score": 100, "issues": 0})
                 score = data.get('score', 100)
                 issues = data.get('issues', 0)
-                html += f"""
+                parts.append(f"""
                         <tr>
                             <td>{device}</td>
                             <td>{score}</td>
                             <td>{issues}</td>
                         </tr>
-                """
-            html += """
+                """)
+            parts.append("""
                     </table>
                 </div>
-            """
+            """)
             # Interactive Element Results (DISABLED)
-            # html += """
+            # parts.append("""
             #     <div class=\"card\">
             #         <h2>Interactive Element Results (Per Page)</h2>
-            #     """
-            # html += '<!-- Interactive element results are currently disabled. -->'
-            # html += "</div>"
+            #     """)
+            # parts.append('<!-- Interactive element results are currently disabled. -->')
+            # parts.append("</div>")
             # Responsive Issue Summary Section (grouped and deduplicated)
-            html += """
+            parts.append("""
                 <div class=\"card\">
                     <h2>Responsive Issue Summary</h2>
-                """
-            summary = {}
-            for issue in getattr(self.results, 'responsive_issue_summary', []) or []:
-                key = (issue['issue_type'], issue.get('fix', ''))
-                if key not in summary:
-                    summary[key] = {
-                        'issue_type': issue['issue_type'],
-                        'fix': issue.get('fix', ''),
-                        'severity': issue.get('severity', ''),
-                        'count': 0,
-                        'examples': set()
-                    }
-                summary[key]['count'] += issue.get('count', 1)
-                if 'example_selector' in issue and issue['example_selector']:
-                    summary[key]['examples'].add(issue['example_selector'])
-            html += "<ul>"
+                """)
+            summary = group_responsive_issues(self.results)
+            parts.append("<ul>")
             for key, val in summary.items():
-                html += f"<li><strong>{key[0]}</strong>: {val['count']} occurrences. Fix: {key[1]}</li>"
-            html += "</ul>"
-            html += """
+                parts.append(f"<li><strong>{escape(key[0])}</strong>: {val['count']} occurrences. Fix: {escape(key[1])}</li>")
+            parts.append("</ul>")
+            parts.append("""
                 </div>
-                """
+                """)
             # After responsive issues, update responsiveness scores
             if hasattr(self.results, 'update_responsiveness_scores'):
                 self.results.update_responsiveness_scores()
             # --- Performance Section ---
-            html += """
+            parts.append("""
                 <div class=\"card\">
                     <h2>Performance</h2>
-            """
+            """)
             # Merge warnings from failed steps and self.results.warnings
-            all_warnings = []
-            for fail in self.results.failed:
-                if isinstance(fail, dict) and "issues" in fail and fail["issues"]:
-                    crits = [i for i in fail["issues"] if i.get("severity") == "Critical"]
-                    if not crits:
-                        all_warnings.append(fail)
-            if getattr(self.results, 'warnings', []):
-                all_warnings.extend(self.results.warnings)
+            all_warnings = [
+                fail for fail in self.results.failed
+                if isinstance(fail, dict) and fail.get("issues")
+                and not any(i.get("severity") == "Critical" for i in fail["issues"])
+            ]
+            all_warnings.extend(warnings)
             if all_warnings:
-                html += "<h3>Warnings</h3><ul>"
+                parts.append("<h3>Warnings</h3><ul>")
                 for warn in all_warnings:
-                    html += f'<li><span class="badge warning">Warning</span> <b>{warn.get("step", warn.get("reason", "Warning"))}:</b> {warn.get("reason", "")}</li>'
-                html += "</ul>"
+                    parts.append(f'<li><span class="badge warning">Warning</span> <b>{escape(str(warn.get("step", warn.get("reason", "Warning"))))}:</b> {escape(str(warn.get("reason", "")))}</li>')
+                parts.append("</ul>")
             # Only show 'No performance issues found.' if there are truly no warnings and no slow pages
-            if not all_warnings and not getattr(self.results, 'slow_pages', []):
-                html += "<p>No performance issues found.</p>"
-            html += "</div>"
+            if not all_warnings and not slow_pages:
+                parts.append("<p>No performance issues found.</p>")
+            parts.append("</div>")
             
             # Interactive Element Summary Section (new section)
             summary = {}
             if hasattr(self.results, 'interaction_summary') and self.results.interaction_summary:
                 summary = self.results.interaction_summary
-                html += """
+                parts.append("""
                     <div class=\"card\">
                         <h2>Interactive Element Testing Summary</h2>
-                """
+                """)
                 # Add summary stats
-                html += f"""
-                    <div class=\"stats\">
-                        <div class=\"stat-card\">
-                            <div class=\"stat-label\">Total Tested</div>
-                            <div class=\"stat-number\">{summary.get("total_tested", 0)}</div>
-                        </div>
-                        <div class=\"stat-card\">
-                            <div class=\"stat-label\">Successful</div>
-                            <div class=\"stat-number success\">{summary.get("successful", 0)}</div>
-                        </div>
-                        <div class=\"stat-card\">
-                            <div class=\"stat-label\">Content Changed</div>
-                            <div class=\"stat-number success\">{summary.get("content_changed", 0)}</div>
-                        </div>
-                        <div class=\"stat-card\">
-                            <div class=\"stat-label\">URL Changed</div>
-                            <div class=\"stat-number success\">{summary.get("url_changed", 0)}</div>
-                        </div>
-                        <div class=\"stat-card\">
-                            <div class=\"stat-label\">Failed</div>
-                            <div class=\"stat-number error\">{summary.get("failed", 0)}</div>
-                        </div>
-                    </div>
-                """
+                parts.append(_TPL_INTERACTIVE_STATS.format_map(defaultdict(int, summary)))
                 # Add issues table if there are any
                 if summary.get("issues"):
-                    html += """
+                    parts.append("""
                         <h3>Interactive Element Issues</h3>
                         <table>
                             <tr>
@@ -686,69 +863,54 @@ class HTMLReportGenerator:
                                 <th>Issue</th>
                                 <th>Load Time</th>
                             </tr>
-                    """
-                    for issue in summary.get("issues", []):
-                        issue_type = issue.get('issue', 'Unknown issue')
-                        issue_class = 'warning' if 'no visible change' in issue_type.lower() else 'error'
-                        html += f"""
-                            <tr class=\"{issue_class}\">
-                                <td>{issue.get('element', 'Unknown')}</td>
-                                <td>{issue.get('type', 'Unknown')}</td>
-                                <td>{issue_type}</td>
-                                <td>{issue.get('load_time', 'N/A')}</td>
-                            </tr>
-                        """
-                    html += "</table>"
-                html += "</div>"
+                    """)
+                    parts.append("".join([_interactive_issue_row(issue) for issue in summary["issues"]]))
+                    parts.append("</table>")
+                parts.append("</div>")
             
             # Broken Links Section
-            html += """
+            parts.append("""
                 <div class=\"card\">
                     <h2>Broken Links</h2>
-            """
+            """)
             if getattr(self.results, 'broken_links', []):
-                html += "<ul>"
+                parts.append("<ul>")
                 for link in self.results.broken_links:
-                    html += f"<li>{link}</li>"
-                html += "</ul>"
+                    parts.append(f"<li>{escape(link)}</li>")
+                parts.append("</ul>")
             else:
-                html += "<p>No broken links found.</p>"
-            html += "</div>"
+                parts.append("<p>No broken links found.</p>")
+            parts.append("</div>")
             # JavaScript Errors Section
-            html += """
+            parts.append("""
                 <div class=\"card\">
                     <h2>JavaScript Issues</h2>
-            """
-            if getattr(self.results, 'js_errors', []):
-                error_types = {}
-                for error in self.results.js_errors:
-                    error_msg = error["message"]
-                    if error_msg not in error_types:
-                        error_types[error_msg] = 1
-                    else:
-                        error_types[error_msg] += 1
+            """)
+            if js_errors:
+                # Listed in first-seen order (Counter keeps insertion order)
+                error_types = Counter(error["message"] for error in js_errors)
                 for msg, count in error_types.items():
-                    html += f"<p>{msg} (x{count})</p>"
+                    parts.append(f"<p>{escape(msg)} (x{count})</p>")
             else:
-                html += "<p>No JavaScript errors found.</p>"
-            html += "</div>"
+                parts.append("<p>No JavaScript errors found.</p>")
+            parts.append("</div>")
             # Test Details Section
-            html += """
+            parts.append("""
                 <div class=\"card\">
                     <h2>Test Details</h2>
-            """
+            """)
             if filtered_passed:
-                html += "<h3>Passed Tests</h3><ul>"
+                parts.append("<h3>Passed Tests</h3><ul>")
                 for test in filtered_passed:
                     step = test.get("step", "Not Applicable")
                     load_time = test.get("load_time", "N/A")
                     if load_time not in ["N/A", "N/As", None]:
-                        html += f"<li>{step} ({load_time}s)</li>"
+                        parts.append(f"<li>{escape(str(step))} ({load_time}s)</li>")
                     else:
-                        html += f"<li>{step}</li>"
-                html += "</ul>"
+                        parts.append(f"<li>{escape(str(step))}</li>")
+                parts.append("</ul>")
             else:
-                html += "<p>No passed tests.</p>"
+                parts.append("<p>No passed tests.</p>")
             # Group failed tests by error/reason
             failed_tests = filtered_failed
             # Collect URLs of navigation failures to add to broken links
@@ -756,150 +918,108 @@ class HTMLReportGenerator:
             for test in failed_tests:
                 reason = test.get("reason") or test.get("error") or ""
                 url = test.get("url", "")
-                if 'navigation failed' in reason.lower() and url:
+                if url and _NAV_FAILED_RE.search(reason):
                     nav_failed_urls.add(url)
             # Add navigation failed URLs to broken_links if not already present
             if hasattr(self.results, 'broken_links') and isinstance(self.results.broken_links, list):
+                known_links = set(self.results.broken_links)
                 for url in nav_failed_urls:
-                    if url and url not in self.results.broken_links:
+                    if url and url not in known_links:
                         self.results.broken_links.append(url)
+                        known_links.add(url)
             if failed_tests:
-                html += '<h3 style="color:#d93025;">Failed Tests</h3><ul>'
-                for test in failed_tests:
-                    reason = test.get("reason") or test.get("error") or "[No error message provided]"
-                    step = test.get("step") or "[Step name missing]"
-                    url = test.get("url", "N/A")
-                    if step == '[Step name missing]' and reason == '[No error message provided]':
-                        continue
-                    if 'navigation failed' in reason.lower() or 'failed to navigate' in reason.lower():
-                        html += f'<li style="color:#d93025;"><b>{step}</b>: {reason} <a href="{url}" target="_blank">🔗</a></li>'
-                    elif 'http status' in reason.lower() or '405' in reason or 'method not allowed' in reason.lower():
-                        html += f'<li style="color:#d93025;"><b>{step}</b>: {reason} at <code>{url}</code></li>'
-                    else:
-                        html += f'<li style="color:#d93025;"><b>{step}</b>: {reason}</li>'
-                html += '</ul>'
+                parts.append('<h3 style="color:#d93025;">Failed Tests</h3><ul>')
+                parts.append("".join([_failed_test_item(test) for test in failed_tests]))
+                parts.append('</ul>')
             else:
-                html += '<p>No failed tests.</p>'
-            html += "</div>"
+                parts.append('<p>No failed tests.</p>')
+            parts.append("</div>")
             # Recommendations Section (HTML, always show)
-            html += """
+            parts.append("""
                 <div class=\"card\">
                     <h2>Recommendations</h2>
-            """
+            """)
             wrote_any = False
             # Performance
-            if getattr(self.results, 'slow_pages', []):
-                html += "<h3>Performance Improvements</h3>"
-                html += "<ul>"
-                html += "<li>The following pages were slow to load (over 2s):<ul>"
-                for page in self.results.slow_pages[:5]:
-                    html += f"<li>{page['url']} ({page['load_time']}s)</li>"
-                html += "</ul></li>"
-                html += "<li>Suggestions:<ul>"
-                html += "<li>Optimize images (compress, use WebP)</li>"
-                html += "<li>Minimize and defer JavaScript/CSS</li>"
-                html += "<li>Use lazy loading for images</li>"
-                html += "<li>Audit with Chrome DevTools or Lighthouse</li>"
-                html += "</ul></li>"
-                html += "</ul>"
+            if slow_pages:
+                parts.append("<h3>Performance Improvements</h3>")
+                parts.append("<ul>")
+                parts.append("<li>The following pages were slow to load (over 2s):<ul>")
+                for page in slow_pages[:5]:
+                    parts.append(f"<li>{escape(page['url'])} ({page['load_time']}s)</li>")
+                parts.append(_HTML_SLOW_PAGE_ADVICE)
                 wrote_any = True
             # JavaScript Errors
-            if getattr(self.results, 'js_errors', []):
-                html += "<h3>JavaScript Issues</h3>"
-                html += "<ul>"
-                html += "<li>JavaScript errors were detected.</li>"
-                html += "<li>Use browser dev tools to debug errors.</li>"
-                html += "<li>Check for deprecated APIs or syntax.</li>"
-                html += "<li>Review recent code changes.</li>"
-                html += "</ul>"
+            if js_errors:
+                parts.append(_HTML_JS_ADVICE)
                 wrote_any = True
             # Broken Links
             if getattr(self.results, 'broken_links', []):
-                html += "<h3>Broken Links</h3>"
-                html += "<ul>"
-                html += "<li>Broken links were found.</li>"
-                html += "<li>Fix or remove broken links.</li>"
-                html += "<li>Use a site-wide link checker.</li>"
-                html += "</ul>"
+                parts.append(_HTML_BROKEN_LINKS_ADVICE)
                 wrote_any = True
             # UI/Accessibility Issues
-            if hasattr(self.results, 'ui_issue_summary') and self.results.ui_issue_summary:
-                html += "<h3>UI/Accessibility Issues</h3>"
-                html += "<ul>"
-                for issue in self.results.ui_issue_summary:
-                    html += f"<li>{issue['issue_type']}: {issue['count']} occurrences. Fix: {issue['fix']}</li>"
-                html += "<li>Use axe-core or Lighthouse for accessibility testing.</li>"
-                html += "</ul>"
+            if ui_issues:
+                parts.append("<h3>UI/Accessibility Issues</h3>")
+                parts.append("<ul>")
+                for issue_type, count, fix in map(_issue_line_fields, ui_issues):
+                    parts.append(f"<li>{escape(issue_type)}: {count} occurrences. Fix: {escape(fix)}</li>")
+                parts.append("<li>Use axe-core or Lighthouse for accessibility testing.</li>")
+                parts.append("</ul>")
                 wrote_any = True
             # SSL/Security
-            if hasattr(self.results, 'ssl_status') and self.results.ssl_status:
-                ssl_status = self.results.ssl_status.get('status', '').lower()
+            if ssl_info:
+                ssl_status = ssl_info.get('status', '').lower()
                 if ssl_status != 'valid':
-                    html += "<h3>Security Issues</h3>"
-                    html += "<ul>"
-                    html += "<li>SSL certificate is not valid.</li>"
-                    html += "<li>Renew certificate and ensure HTTPS everywhere.</li>"
-                    html += "</ul>"
+                    parts.append(_HTML_SECURITY_ADVICE)
                     wrote_any = True
             # Responsive Issues
-            if hasattr(self.results, 'responsive_issue_summary') and self.results.responsive_issue_summary:
-                html += "<h3>Responsive Design Issues</h3><ul>"
-                summary = {}
-                for issue in self.results.responsive_issue_summary:
-                    key = (issue['issue_type'], issue.get('fix', ''))
-                    if key not in summary:
-                        summary[key] = {
-                            'issue_type': issue['issue_type'],
-                            'fix': issue.get('fix', ''),
-                            'severity': issue.get('severity', ''),
-                            'count': 0,
-                            'examples': set()
-                        }
-                    summary[key]['count'] += issue.get('count', 1)
-                    if 'example_selector' in issue and issue['example_selector']:
-                        summary[key]['examples'].add(issue['example_selector'])
-                for key, val in summary.items():
-                    html += f"<li><strong>{key[0]}</strong>: {val['count']} occurrences. Fix: {key[1]}</li>"
-                html += "<li>Test on multiple devices and viewports.</li>"
-                html += "</ul>"
+            if responsive_issues:
+                parts.append("<h3>Responsive Design Issues</h3><ul>")
+                for key, val in group_responsive_issues(self.results).items():
+                    parts.append(f"<li><strong>{escape(key[0])}</strong>: {val['count']} occurrences. Fix: {escape(key[1])}</li>")
+                parts.append("<li>Test on multiple devices and viewports.</li>")
+                parts.append("</ul>")
                 wrote_any = True
             # Interaction Reliability
             if summary.get("issues"):
-                html += "<h3>Interaction Reliability</h3>"
-                html += "<ul>"
-                html += "<li>Review elements marked as 'no visible change' for potential improvements in interaction logic.</li>"
-                html += "<li>Ensure elements are fully loaded and visible before interaction.</li>"
-                html += "<li>Consider adding more specific result selectors for content change detection.</li>"
-                html += "</ul>"
+                parts.append(_HTML_INTERACTION_ADVICE)
                 wrote_any = True
             # If nothing specific, show maintenance
             if not wrote_any:
-                html += "<h3>Maintenance</h3>"
-                html += "<ol>"
-                html += "<li>📈 Monitor performance metrics</li>"
-                html += "<li>🔍 Regular testing of critical paths</li>"
-                html += "<li>🔒 Keep security measures up to date</li>"
-                html += "</ol>"
-            html += """
+                parts.append(_HTML_MAINTENANCE)
+            parts.append("""
                 </div>
             </div>
         </body>
         </html>
-        """
-            with open(report_file, "w", encoding="utf-8") as f:
-                f.write(html)
+        """)
+            _write_report(report_file, parts)
             return str(report_file)
         except Exception as e:
             print(f"Error generating HTML report: {str(e)}")
             return ""
 
-    def _get_status_class(self, rate: float) -> str:
+    @staticmethod
+    def _get_status_class(rate: float) -> str:
         """Get the appropriate status class based on rate"""
-        if rate >= 90:
-            return 'success'
-        elif rate >= 70:
-            return 'warning'
-        return 'error'
+        return _STATUS_CLASSES[bisect_right(_STATUS_BOUNDS, rate)]
+
+
+def generate_all(results) -> Tuple[str, str]:
+    """
+    Generate the Markdown and HTML reports for one set of results
+    
+    The shared responsive scoring and grouping run once up front. The reports are built one after the
+    other, Markdown first: it adds failed-navigation URLs to results.broken_links, which the HTML report lists.
+    
+    Returns:
+        Paths to the Markdown and HTML report files
+    """
+    compute_responsiveness_scores(results)
+    group_responsive_issues(results)
+    md_report = MarkdownReportGenerator(results).generate()
+    html_report = HTMLReportGenerator(results).generate()
+    return md_report, html_report
 
 
 def generate_report_from_results_file(results_file: str) -> str:
@@ -913,8 +1033,8 @@ def generate_report_from_results_file(results_file: str) -> str:
         Path to the generated report file
     """
     try:
-        with open(results_file, "r") as f:
-            data = json.load(f)
+        # Both parsers take the raw bytes, so skip decoding to str first
+        data = _json_loads(Path(results_file).read_bytes())
         
         from qa_bot import TestResults
         # Convert the JSON data to a TestResults object
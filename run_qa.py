@@ -22,22 +22,28 @@ def run(
 
 async def run_qa_test(url=None, username=None, password=None, headless=False):
     """Run the QA bot with the original functionality"""
-    # Get website URL if not provided
-    if not url:
-        url = input("Enter website URL to test (including https://): ")
+    bot = QABot(headless=headless)
+    # Launch the browser while the user answers the prompts; input() runs in a thread so the launch keeps going
+    setup_task = asyncio.create_task(bot.setup())
+    try:
+        # Get website URL if not provided
         if not url:
-            url = "https://uat.parfumhaus.online"  # Default URL
-    
-    # Get credentials if not provided
-    if not username:
-        username = input("Enter username (leave empty to skip login): ")
-    
-    if username and not password:
-        password = input("Enter password: ")
+            url = await asyncio.to_thread(input, "Enter website URL to test (including https://): ")
+            if not url:
+                url = "https://uat.parfumhaus.online"  # Default URL
+        
+        # Get credentials if not provided
+        if not username:
+            username = await asyncio.to_thread(input, "Enter username (leave empty to skip login): ")
+        
+        if username and not password:
+            password = await asyncio.to_thread(input, "Enter password: ")
+    except BaseException:
+        setup_task.cancel()
+        raise
     
     print(f"Starting QA Bot test on {url}...")
-    bot = QABot(headless=headless)
-    await bot.setup()
+    await setup_task
     
     credentials = None
     if username and password:
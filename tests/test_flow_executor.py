@@ -0,0 +1,74 @@
+"""
+Tests for FlowExecutor step batching, run against a stubbed page (no browser needed)
+"""
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flow_manager import FlowExecutor
+
+
+class _StubPage:
+    """Just enough of a Playwright page for click and assert_text steps"""
+
+    def __init__(self, texts):
+        self.texts = dict(texts)
+
+    async def evaluate(self, script, selectors):
+        return {sel: self.texts.get(sel) for sel in selectors}
+
+    async def inner_text(self, selector, timeout=None):
+        return self.texts[selector]
+
+    async def click(self, selector, timeout=None):
+        self.texts["#msg"] = "new"
+
+
+class _StubFlowManager:
+    def __init__(self, flow):
+        self.flow = flow
+
+    def load_flow(self, flow_name, environment="prod"):
+        return self.flow
+
+
+class PrefetchedTextTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # FlowExecutor creates its screenshots directory in the working directory
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    async def test_grouped_steps_drop_prefetched_text(self):
+        flow = {
+            "name": "prefetch",
+            "base_url": "https://example.com",
+            "steps": [
+                {"name": "Old message", "action": "assert_text", "selector": "#msg", "text": "old"},
+                {"name": "Other text", "action": "assert_text", "selector": "#other", "text": "x"},
+                {"name": "Click A", "action": "click", "selector": "#a", "group": "g"},
+                {"name": "Click B", "action": "click", "selector": "#b", "group": "g"},
+                {"name": "New message", "action": "assert_text", "selector": "#msg", "text": "new"},
+            ],
+        }
+        page = _StubPage({"#msg": "old", "#other": "x"})
+        qa_bot = SimpleNamespace(page=page, base_url=None, results=SimpleNamespace(passed=[], failed=[]))
+        executor = FlowExecutor(qa_bot, flow_manager=_StubFlowManager(flow), capture_diagnostics=False)
+
+        results = await executor.execute_flow("prefetch")
+
+        self.assertEqual(results["failed"], [])
+        self.assertEqual([step["step"] for step in results["passed"]],
+                         ["Old message", "Other text", "Click A", "Click B", "New message"])
+
+
+if __name__ == "__main__":
+    unittest.main()